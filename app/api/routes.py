@@ -1,13 +1,15 @@
 """API routes for the AWS Bedrock API Service."""
 
-from fastapi import APIRouter, HTTPException, Depends, status
-from typing import Annotated, Optional
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Depends, status
+from typing import Annotated, Dict, Optional
+import asyncio
 import logging
 import json
+from datetime import datetime
 
 from app.api.schemas import AnalysisRequest
 from app.services.analysis_service import AnalysisService, ServiceError
-from app.services.email_notification_service import EmailNotificationService
+from app.services.email_notification_service import EmailNotificationService, normalize_prioridad
 from app.clients.email_client import SendGridEmailClient
 from app.config.settings import Settings
 
@@ -26,6 +28,8 @@ router = APIRouter(
 
 _analysis_service: AnalysisService = None
 _settings: Optional[Settings] = None
+# SendGrid clients reused across requests, keyed by testing mode
+_email_clients: Dict[bool, SendGridEmailClient] = {}
 
 
 def set_analysis_service(service: AnalysisService) -> None:
@@ -43,9 +47,17 @@ def set_settings(settings: Settings) -> None:
     if settings is None:
         raise ValueError("Settings cannot be None")
     _settings = settings
+    close_email_clients()
     logger.info("Settings configured")
 
 
+def close_email_clients() -> None:
+    """Close the cached SendGrid clients and their pooled connections."""
+    for email_client in _email_clients.values():
+        email_client.close()
+    _email_clients.clear()
+
+
 def get_analysis_service() -> AnalysisService:
     """Dependency injection for AnalysisService."""
     if _analysis_service is None:
@@ -74,15 +86,40 @@ def get_notification_service(is_testing: bool = False) -> EmailNotificationServi
             detail="Service not initialized"
         )
     
-    # Create email client with appropriate mode
-    email_client = SendGridEmailClient(
-        api_key=_settings.sendgrid_api_key,
-        from_email=_settings.sendgrid_from_email,
-        is_testing=is_testing,
-        test_email_override=_settings.sendgrid_test_email
-    )
+    # Reuse the email client for this mode so its connections outlive the request
+    email_client = _email_clients.get(is_testing)
+    if email_client is None:
+        email_client = SendGridEmailClient(
+            api_key=_settings.sendgrid_api_key,
+            from_email=_settings.sendgrid_from_email,
+            is_testing=is_testing,
+            test_email_override=_settings.sendgrid_test_email,
+            endpoint=_settings.sendgrid_endpoint,
+            pool_size=_settings.email_pool_size,
+            max_messages_per_connection=_settings.email_max_messages_per_connection,
+            keep_alive=True
+        )
+        _email_clients[is_testing] = email_client
     
-    return EmailNotificationService(email_client)
+    return EmailNotificationService(email_client, max_workers=_settings.email_pool_size)
+
+
+def _send_notifications_in_background(
+    notification_service: EmailNotificationService,
+    analysis_result: dict,
+    current_date: str,
+    is_testing: bool
+) -> None:
+    """Send analysis notifications after the response has been returned."""
+    try:
+        notification_result = notification_service.send_analysis_notifications(
+            analysis_result=analysis_result,
+            current_date=current_date,
+            is_testing=is_testing
+        )
+        logger.info(f"Background email notifications sent: {notification_result['total_sent']} successful, {notification_result['total_failed']} failed")
+    except Exception as e:
+        logger.error(f"Background email notifications failed: {str(e)}", exc_info=True)
 
 
 @router.post(
@@ -92,7 +129,8 @@ def get_notification_service(is_testing: bool = False) -> EmailNotificationServi
 )
 async def analyze_data(
     request: AnalysisRequest,
-    service: Annotated[AnalysisService, Depends(get_analysis_service)]
+    service: Annotated[AnalysisService, Depends(get_analysis_service)],
+    background_tasks: BackgroundTasks
 ):
     """
     POST endpoint for sales analysis with email notifications.
@@ -308,22 +346,37 @@ async def analyze_data(
             # Create notification service with appropriate testing mode
             notification_service = get_notification_service(is_testing=request.is_testing)
             
-            # Send notifications
-            notification_result = notification_service.send_analysis_notifications(
-                analysis_result={"data": parsed_analysis},
-                current_date=request.current_date,
-                is_testing=request.is_testing
-            )
-            
-            response_data["email_notifications"] = notification_result
-            logger.info(f"Email notifications sent: {notification_result['total_sent']} successful, {notification_result['total_failed']} failed")
+            # Send notifications, after the response when configured to
+            if _settings.email_send_in_background:
+                background_tasks.add_task(
+                    _send_notifications_in_background,
+                    notification_service,
+                    {"data": parsed_analysis},
+                    request.current_date,
+                    request.is_testing
+                )
+                response_data["email_notifications"] = {"status": "queued"}
+                logger.info("Email notifications queued for background sending")
+            else:
+                notification_result = await notification_service.send_analysis_notifications_async(
+                    analysis_result={"data": parsed_analysis},
+                    current_date=request.current_date,
+                    is_testing=request.is_testing
+                )
+                
+                response_data["email_notifications"] = notification_result
+                logger.info(f"Email notifications sent: {notification_result['total_sent']} successful, {notification_result['total_failed']} failed")
             
             # Store recommendations in database after successful analysis
             if service._memory_enabled and isinstance(parsed_analysis, dict):
                 logger.info("Validating and storing recommendations...")
-                stored_count = 0
                 filtered_count = 0
                 invalid_count = 0
+                pending_items = []
+                pending_embeddings = []
+                # Accepted-but-unstored recommendations per (executive_id, client_rut),
+                # compared like history so one run cannot queue near-duplicates
+                pending_by_client = {}
                 
                 # Get original data to validate client ownership
                 original_data = service._data_client.query(query_params)
@@ -339,7 +392,7 @@ async def analyze_data(
                 ejecutivos = parsed_analysis.get("ejecutivos", [])
                 for ejecutivo in ejecutivos:
                     executive_id = str(ejecutivo.get("id_ejecutivo", ""))
-                    sugerencias = ejecutivo.get("sugerencias_clientes", [])
+                    sugerencias = ejecutivo.get("sugerencias_clientes") or []
                     
                     # Validate: should have exactly 3 recommendations
                     if len(sugerencias) != 3:
@@ -374,10 +427,11 @@ async def analyze_data(
                         new_embedding = service._embedding_client.generate_embedding(rec_text)
                         new_rec = {"recommendation": rec_text, "embedding": new_embedding}
                         
-                        # Check similarity with historical recommendations
+                        # Check similarity with historical and already-queued recommendations
+                        queued_recs = pending_by_client.setdefault((executive_id, client_rut), [])
                         should_filter, matching_rec = service._similarity_service.check_recommendation_similarity(
                             new_recommendation=new_rec,
-                            historical_recommendations=historical_recs
+                            historical_recommendations=queued_recs + historical_recs
                         )
                         
                         if should_filter:
@@ -385,20 +439,34 @@ async def analyze_data(
                             logger.info(f"Filtered recommendation for executive {executive_id}, client {client_rut} (similar to recent)")
                             continue
                         
-                        # Store using memory store (with embeddings)
-                        service._memory_store.store_recommendation(
-                            executive_id=executive_id,
-                            client_id=client_rut,
-                            recommendation_text=rec_text,
-                            metadata={
-                                "prioridad": sugerencia.get("prioridad"),
+                        # Queue for a single batched store (reusing the embedding)
+                        pending_items.append((
+                            executive_id,
+                            client_rut,
+                            rec_text,
+                            {
+                                "prioridad": normalize_prioridad(sugerencia.get("prioridad")),
                                 "accion": sugerencia.get("accion"),
                                 "origen": sugerencia.get("origen"),
                                 "cliente_nombre": sugerencia.get("cliente_nombre"),
                                 "status": "repeated_no_change" if matching_rec else "new"
                             }
-                        )
-                        stored_count += 1
+                        ))
+                        pending_embeddings.append(new_embedding)
+                        queued_recs.append({
+                            "recommendation": rec_text,
+                            "embedding": new_embedding,
+                            "timestamp": datetime.utcnow().isoformat()
+                        })
+                
+                # Store using memory store (with embeddings), off the event loop so
+                # retry backoff on transient MongoDB errors does not block other requests
+                stored_ids = await asyncio.to_thread(
+                    service._memory_store.store_recommendations,
+                    pending_items,
+                    embeddings=pending_embeddings
+                )
+                stored_count = len(stored_ids)
                 
                 logger.info(f"Recommendations processed: {stored_count} stored, {filtered_count} filtered, {invalid_count} invalid")
                 response_data["recommendations_stored"] = stored_count
@@ -1,9 +1,17 @@
 """Email client interface and SendGrid implementation."""
 
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Dict, Any, Optional, Iterator
+import json
 import logging
+import queue
+import threading
+import requests
+from requests.adapters import HTTPAdapter
 from sendgrid import SendGridAPIClient
+from urllib3.util.retry import Retry
 from sendgrid.helpers.mail import Mail
 
 
@@ -35,6 +43,34 @@ class IEmailClient(ABC):
             ValueError: If parameters are invalid
         """
         pass
+    
+    @contextmanager
+    def session(self) -> Iterator["IEmailClient"]:
+        """
+        Keep the underlying connection open across several send_email calls.
+        
+        Implementations with a persistent transport should open it on enter and
+        close it on exit. The default implementation does nothing.
+        
+        Yields:
+            The client itself
+        """
+        yield self
+    
+    def close(self) -> None:
+        """
+        Release connections kept open between sessions.
+        
+        The default implementation does nothing.
+        """
+        pass
+
+
+@dataclass
+class _PooledConnection:
+    """HTTP session checked out from the SendGrid connection pool."""
+    http: requests.Session
+    sent: int = 0
 
 
 class SendGridEmailClient(IEmailClient):
@@ -45,7 +81,11 @@ class SendGridEmailClient(IEmailClient):
         api_key: str,
         from_email: str,
         is_testing: bool = False,
-        test_email_override: Optional[str] = None
+        test_email_override: Optional[str] = None,
+        endpoint: str = "https://api.sendgrid.com/v3/mail/send",
+        pool_size: int = 5,
+        max_messages_per_connection: int = 100,
+        keep_alive: bool = False
     ):
         """
         Initialize SendGrid client.
@@ -55,6 +95,11 @@ class SendGridEmailClient(IEmailClient):
             from_email: Default sender email
             is_testing: If True, redirect all emails to test_email_override
             test_email_override: Email address for testing mode
+            endpoint: SendGrid mail/send endpoint used inside session()
+            pool_size: Number of keep-alive connections opened by session()
+            max_messages_per_connection: Messages sent on a connection before it is recycled
+            keep_alive: If True, keep the pool open after session() exits so later
+                sessions reuse it; call close() to release it
             
         Raises:
             ValueError: If required parameters are missing or invalid
@@ -65,14 +110,156 @@ class SendGridEmailClient(IEmailClient):
             raise ValueError("from_email cannot be empty")
         if is_testing and not test_email_override:
             raise ValueError("test_email_override required when is_testing=True")
+        if pool_size <= 0:
+            raise ValueError("pool_size must be positive")
+        if max_messages_per_connection <= 0:
+            raise ValueError("max_messages_per_connection must be positive")
             
         self._api_key = api_key
         self._from_email = from_email
         self._is_testing = is_testing
         self._test_email_override = test_email_override
+        self._endpoint = endpoint
+        self._pool_size = pool_size
+        self._max_messages_per_connection = max_messages_per_connection
         self._client = SendGridAPIClient(api_key)
+        self._keep_alive = keep_alive
+        self._connection_pool: Optional[queue.Queue] = None
+        self._pool_lock = threading.Lock()
+        self._session_users = 0
         self._logger = logging.getLogger(__name__)
     
+    @contextmanager
+    def session(self) -> Iterator["SendGridEmailClient"]:
+        """
+        Reuse a pool of keep-alive HTTPS connections for every email sent in the block.
+        
+        send_email may be called from up to pool_size threads concurrently;
+        each call checks out one connection. Outside a session each send opens
+        its own TCP+TLS connection through the SendGrid SDK.
+        
+        Concurrent or nested sessions share one pool. It is closed when the
+        last session exits, unless the client was created with keep_alive.
+        """
+        with self._pool_lock:
+            if self._connection_pool is None:
+                pool = queue.Queue()
+                for _ in range(self._pool_size):
+                    pool.put(_PooledConnection(self._open_http_session()))
+                self._connection_pool = pool
+            self._session_users += 1
+        try:
+            yield self
+        finally:
+            with self._pool_lock:
+                self._session_users -= 1
+                if self._session_users == 0 and not self._keep_alive:
+                    self._close_pool()
+    
+    def close(self) -> None:
+        """Close the pooled connections kept open by keep_alive."""
+        with self._pool_lock:
+            self._close_pool()
+    
+    def _close_pool(self) -> None:
+        """
+        Close every idle pooled connection. Caller must hold _pool_lock.
+        
+        Connections checked out by sends in progress are closed when they are
+        returned, since the pool they came from is no longer current.
+        """
+        pool = self._connection_pool
+        self._connection_pool = None
+        while pool is not None and not pool.empty():
+            pool.get_nowait().http.close()
+    
+    def _checkout(self, pool: queue.Queue) -> Optional[_PooledConnection]:
+        """
+        Take a connection from pool, or None if the pool is closed meanwhile.
+        
+        Waits in short steps so a caller queued on a pool that gets closed does
+        not block forever.
+        """
+        while True:
+            try:
+                return pool.get(timeout=0.5)
+            except queue.Empty:
+                if self._connection_pool is not pool:
+                    return None
+    
+    def _release(self, pool: queue.Queue, connection: _PooledConnection) -> None:
+        """Return a connection to pool, or close it if the pool was closed."""
+        with self._pool_lock:
+            if self._connection_pool is pool:
+                pool.put(connection)
+                return
+        connection.http.close()
+    
+    def _open_http_session(self) -> requests.Session:
+        """
+        Create an HTTP session authenticated against the SendGrid API.
+        
+        Failures to establish the connection are retried once by urllib3. Errors
+        after the request may have been sent are never retried, since SendGrid
+        could already have accepted the message.
+        """
+        http_session = requests.Session()
+        retry = Retry(total=1, connect=1, read=0, status=0, other=0, redirect=0)
+        http_session.mount("https://", HTTPAdapter(max_retries=retry))
+        http_session.headers.update({
+            "Authorization": f"Bearer {self._api_key}",
+            "Content-Type": "application/json"
+        })
+        return http_session
+    
+    def _post_message(self, message: Mail, pool: queue.Queue) -> int:
+        """
+        Send a message over a pooled HTTP connection.
+        
+        Connections are recycled after max_messages_per_connection messages.
+        A connection that fails is replaced in the pool, but the message is
+        not sent again: the body may already have reached SendGrid, and a
+        resend could deliver the email twice.
+        
+        Args:
+            message: Message to send
+            pool: Connection pool read once by send_email; if it is closed
+                before a connection is free, the message goes through the SDK
+            
+        Returns:
+            HTTP status code of the response
+            
+        Raises:
+            requests.ConnectionError: If the connection failed; the send is reported as failed
+        """
+        # Serialize once, straight to UTF-8: the HTML is mostly non-ASCII
+        # (accents, emoji) that the default json= path would \u-escape
+        body = json.dumps(message.get(), ensure_ascii=False).encode("utf-8")
+        
+        connection = self._checkout(pool)
+        if connection is None:
+            return self._client.send(message).status_code
+        
+        try:
+            if connection.sent >= self._max_messages_per_connection:
+                connection.http.close()
+                connection = _PooledConnection(self._open_http_session())
+            
+            try:
+                response = connection.http.post(self._endpoint, data=body, timeout=30)
+            except requests.ConnectionError:
+                self._logger.warning("SendGrid connection failed, replacing it without resending")
+                connection.http.close()
+                connection = _PooledConnection(self._open_http_session())
+                raise
+            
+            connection.sent += 1
+        finally:
+            self._release(pool, connection)
+        
+        response.raise_for_status()
+        return response.status_code
+    
     def send_email(
         self,
         to_email: str,
@@ -105,14 +292,22 @@ class SendGridEmailClient(IEmailClient):
             html_content=html_content
         )
         
-        # Send via SendGrid
-        response = self._client.send(message)
+        # Send via SendGrid (pooled connections inside session()); the pool is
+        # read once so a concurrent close() cannot swap it out mid-send
+        pool = self._connection_pool
+        if pool is not None:
+            status_code = self._post_message(message, pool)
+        else:
+            status_code = self._client.send(message).status_code
         
-        self._logger.info(f"Email sent successfully to {actual_recipient} (original: {original_recipient or 'N/A'}), status: {response.status_code}")
+        self._logger.info(
+            "Email sent successfully to %s (original: %s), status: %s",
+            actual_recipient, original_recipient or 'N/A', status_code
+        )
         
         return {
             "success": True,
-            "status_code": response.status_code,
+            "status_code": status_code,
             "message": "Email sent successfully",
             "recipient": actual_recipient,
             "original_recipient": original_recipient
@@ -1,5 +1,6 @@
 """Client for text embedding generation services."""
 
+import hashlib
 import logging
 import os
 
@@ -23,8 +24,10 @@ if not os.environ.get('SSL_CERT_FILE') and not os.environ.get('REQUESTS_CA_BUNDL
                 os.environ['REQUESTS_CA_BUNDLE'] = cert_path
                 break
 
+import numpy as np
 import requests
-from typing import List
+from pathlib import Path
+from typing import Dict, List, Optional
 from app.clients.interfaces import IEmbeddingClient
 
 logger = logging.getLogger(__name__)
@@ -33,13 +36,21 @@ logger = logging.getLogger(__name__)
 class EmbeddingClient(IEmbeddingClient):
     """Client for text-embedding-3-large service."""
     
-    def __init__(self, api_key: str, endpoint: str, model_name: str = "text-embedding-3-large"):
+    def __init__(
+        self,
+        api_key: str,
+        endpoint: str,
+        model_name: str = "text-embedding-3-large",
+        cache_dir: Optional[str] = None
+    ):
         """Initialize the embedding client.
         
         Args:
             api_key: API key for authentication
             endpoint: API endpoint URL
             model_name: Name of the embedding model to use
+            cache_dir: Optional directory where embeddings are cached by text hash;
+                when set, repeated texts are served from memory or disk instead of the API
             
         Raises:
             ValueError: If any parameter is empty or invalid
@@ -55,6 +66,8 @@ class EmbeddingClient(IEmbeddingClient):
         self._endpoint = endpoint
         self._model_name = model_name
         self._session = None
+        self._cache_dir = Path(cache_dir) if cache_dir else None
+        self._cache: Dict[str, List[float]] = {}
     
     def connect(self) -> None:
         """Initialize HTTP session with headers."""
@@ -73,6 +86,11 @@ class EmbeddingClient(IEmbeddingClient):
         if self._session is None:
             raise ConnectionError("Not connected. Call connect() first.")
         
+        if self._cache_dir is not None:
+            cached = self._cached_embedding(self._cache_key(text))
+            if cached is not None:
+                return cached
+        
         payload = {"input": text, "model": self._model_name}
         
         response = self._session.post(self._endpoint, json=payload, timeout=30)
@@ -81,6 +99,9 @@ class EmbeddingClient(IEmbeddingClient):
         data = response.json()
         embedding = data["data"][0]["embedding"]
         
+        if self._cache_dir is not None:
+            self._store_embedding(self._cache_key(text), embedding)
+        
         logger.debug(f"Generated embedding for text (length: {len(text)} chars, vector dim: {len(embedding)})")
         return embedding
     
@@ -95,6 +116,25 @@ class EmbeddingClient(IEmbeddingClient):
         if self._session is None:
             raise ConnectionError("Not connected. Call connect() first.")
         
+        if self._cache_dir is None:
+            return self._request_embeddings(texts)
+        
+        # Only texts missing from the cache are sent to the API
+        keys = [self._cache_key(text) for text in texts]
+        embeddings = [self._cached_embedding(key) for key in keys]
+        missing = [i for i, embedding in enumerate(embeddings) if embedding is None]
+        
+        if missing:
+            generated = self._request_embeddings([texts[i] for i in missing])
+            for i, embedding in zip(missing, generated):
+                self._store_embedding(keys[i], embedding)
+                embeddings[i] = embedding
+        
+        logger.debug(f"Served {len(texts) - len(missing)} of {len(texts)} embeddings from cache")
+        return embeddings
+    
+    def _request_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """Request embeddings for several texts in one API call."""
         payload = {"input": texts, "model": self._model_name}
         
         response = self._session.post(self._endpoint, json=payload, timeout=60)
@@ -105,3 +145,36 @@ class EmbeddingClient(IEmbeddingClient):
         
         logger.debug(f"Generated {len(embeddings)} embeddings in batch (vector dim: {len(embeddings[0]) if embeddings else 0})")
         return embeddings
+    
+    def _cache_key(self, text: str) -> str:
+        """Hash of the model name and text, so changing models never reuses vectors."""
+        return hashlib.sha1(f"{self._model_name}\n{text}".encode("utf-8")).hexdigest()
+    
+    def _cached_embedding(self, key: str) -> Optional[List[float]]:
+        """Return a cached embedding from memory or disk, or None if missing."""
+        if key in self._cache:
+            return self._cache[key]
+        
+        try:
+            embedding = np.load(self._cache_dir / f"{key}.npy").tolist()
+        except (OSError, ValueError):
+            return None
+        
+        self._cache[key] = embedding
+        return embedding
+    
+    def _store_embedding(self, key: str, embedding: List[float]) -> None:
+        """Cache an embedding in memory and on disk; disk errors are only logged."""
+        self._cache[key] = embedding
+        
+        path = self._cache_dir / f"{key}.npy"
+        tmp_path = path.with_name(f"{key}.{os.getpid()}.tmp")
+        try:
+            self._cache_dir.mkdir(parents=True, exist_ok=True)
+            # Float64 keeps cached vectors identical to the API response;
+            # the rename keeps concurrent test processes from reading partial files
+            with open(tmp_path, "wb") as f:
+                np.save(f, np.asarray(embedding, dtype=np.float64))
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not write embedding cache file {path}: {e}")
@@ -86,6 +86,7 @@ class IDataClient(ABC):
                 - collection: Name of the collection/table to query
                 - filter: Filter criteria for the query
                 - projection: Fields to include/exclude in results
+                - sort: List of (field, direction) pairs to order results by
                 - limit: Maximum number of results to return
                 - pipeline: Aggregation pipeline (for MongoDB)
         
@@ -1,6 +1,6 @@
 """MongoDB client implementation for data retrieval."""
 
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
 from pymongo import MongoClient
 from pymongo.errors import ConnectionFailure, OperationFailure, ServerSelectionTimeoutError
 from app.clients.interfaces import IDataClient
@@ -9,20 +9,40 @@ from app.clients.interfaces import IDataClient
 class MongoDBClient(IDataClient):
     """MongoDB implementation of the data client interface."""
     
-    def __init__(self, connection_string: str, database_name: str):
+    def __init__(
+        self,
+        connection_string: str,
+        database_name: str,
+        max_pool_size: int = 100,
+        min_pool_size: int = 0,
+        wait_queue_timeout_ms: Optional[int] = None
+    ):
         if not connection_string:
             raise ValueError("connection_string cannot be empty")
         if not database_name:
             raise ValueError("database_name cannot be empty")
+        if max_pool_size <= 0:
+            raise ValueError("max_pool_size must be positive")
+        if not 0 <= min_pool_size <= max_pool_size:
+            raise ValueError("min_pool_size must be between 0 and max_pool_size")
             
         self._connection_string = connection_string
         self._database_name = database_name
+        self._max_pool_size = max_pool_size
+        self._min_pool_size = min_pool_size
+        self._wait_queue_timeout_ms = wait_queue_timeout_ms
         self._client = None
         self._database = None
     
     def connect(self) -> None:
         """Establish connection to MongoDB."""
-        self._client = MongoClient(self._connection_string, serverSelectionTimeoutMS=5000)
+        self._client = MongoClient(
+            self._connection_string,
+            serverSelectionTimeoutMS=5000,
+            maxPoolSize=self._max_pool_size,
+            minPoolSize=self._min_pool_size,
+            waitQueueTimeoutMS=self._wait_queue_timeout_ms
+        )
         self._client.admin.command('ping')
         self._database = self._client[self._database_name]
     
@@ -59,6 +79,7 @@ class MongoDBClient(IDataClient):
             else:
                 filter_doc = query_params.get("filter", {})
                 projection = query_params.get("projection", None)
+                sort = query_params.get("sort", None)
                 limit = query_params.get("limit", None)
                 
                 if not isinstance(filter_doc, dict):
@@ -67,11 +88,17 @@ class MongoDBClient(IDataClient):
                 if projection is not None and not isinstance(projection, dict):
                     raise ValueError("projection must be a dictionary")
                 
+                if sort is not None and not isinstance(sort, list):
+                    raise ValueError("sort must be a list of (field, direction) pairs")
+                
                 if limit is not None and (not isinstance(limit, int) or limit <= 0):
                     raise ValueError("limit must be a positive integer")
                 
                 cursor = collection.find(filter_doc, projection)
                 
+                if sort:
+                    cursor = cursor.sort(sort)
+                
                 if limit is not None:
                     cursor = cursor.limit(limit)
                 
@@ -103,6 +130,34 @@ class MongoDBClient(IDataClient):
         result = collection.insert_one(document)
         return str(result.inserted_id)
     
+    def insert_many(self, collection_name: str, documents: List[Dict[str, Any]]) -> List[str]:
+        """Insert several documents into a MongoDB collection in one round trip."""
+        if self._client is None or self._database is None:
+            raise ConnectionError("Not connected to MongoDB. Call connect() first.")
+        
+        if not collection_name or not isinstance(collection_name, str):
+            raise ValueError("collection_name must be a non-empty string")
+        
+        if not documents or not all(isinstance(d, dict) and d for d in documents):
+            raise ValueError("documents must be a non-empty list of non-empty dictionaries")
+        
+        collection = self._database[collection_name]
+        result = collection.insert_many(documents)
+        return [str(inserted_id) for inserted_id in result.inserted_ids]
+    
+    def create_index(self, collection_name: str, keys: List[Tuple[str, int]], **options: Any) -> str:
+        """Create an index on a MongoDB collection if it does not exist."""
+        if self._client is None or self._database is None:
+            raise ConnectionError("Not connected to MongoDB. Call connect() first.")
+        
+        if not collection_name or not isinstance(collection_name, str):
+            raise ValueError("collection_name must be a non-empty string")
+        
+        if not keys:
+            raise ValueError("keys cannot be empty")
+        
+        return self._database[collection_name].create_index(keys, **options)
+    
     def get_prompt_template(self, prompt_id: str = "bedrock_analysis_prompt") -> Dict[str, Any]:
         """Retrieve prompt template from MongoDB."""
         if self._client is None or self._database is None:
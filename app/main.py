@@ -48,7 +48,7 @@ from app.services.analysis_service import AnalysisService
 from app.services.recommendation_memory_store import RecommendationMemoryStore
 from app.services.similarity_service import SimilarityService
 from app.services.batch_processor import BatchConfig
-from app.api.routes import router, set_analysis_service, set_settings
+from app.api.routes import router, set_analysis_service, set_settings, close_email_clients
 
 # Configure logging with timestamp, logger name, level, and message
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
@@ -58,6 +58,8 @@ logger = logging.getLogger(__name__)
 _mongodb_client: MongoDBClient = None
 _aws_bedrock_client: AWSBedrockClient = None
 _embedding_client: EmbeddingClient = None
+_memory_store: RecommendationMemoryStore = None
+_analysis_service: AnalysisService = None
 
 
 @asynccontextmanager
@@ -95,6 +97,10 @@ async def lifespan(app: FastAPI):
         _mongodb_client.connect()
         logger.info("MongoDB connected")
     
+    # Create memory indexes once MongoDB is reachable
+    if _memory_store:
+        _memory_store.ensure_indexes()
+    
     # Connect to AWS Bedrock
     if _aws_bedrock_client:
         _aws_bedrock_client.connect()
@@ -113,11 +119,18 @@ async def lifespan(app: FastAPI):
     # Shutdown phase
     logger.info("Shutting down...")
     
+    # Stop batch worker threads
+    if _analysis_service:
+        _analysis_service.shutdown()
+    
     # Disconnect from MongoDB
     if _mongodb_client:
         _mongodb_client.disconnect()
         logger.info("MongoDB disconnected")
     
+    # Close pooled SendGrid connections
+    close_email_clients()
+    
     logger.info("Shutdown complete")
 
 
@@ -157,12 +170,18 @@ def setup_dependencies(app: FastAPI, settings: Settings) -> None:
         >>> setup_dependencies(app, settings)
         # All dependencies are now configured and ready for injection
     """
-    global _mongodb_client, _aws_bedrock_client, _embedding_client
+    global _mongodb_client, _aws_bedrock_client, _embedding_client, _memory_store, _analysis_service
     
     logger.info("Setting up dependencies...")
     
     # Initialize client layer - MongoDB (required)
-    _mongodb_client = MongoDBClient(settings.mongodb_uri, settings.mongodb_database)
+    _mongodb_client = MongoDBClient(
+        settings.mongodb_uri,
+        settings.mongodb_database,
+        max_pool_size=settings.mongodb_max_pool_size,
+        min_pool_size=settings.mongodb_min_pool_size,
+        wait_queue_timeout_ms=settings.mongodb_wait_queue_timeout_ms
+    )
     
     # Initialize client layer - AWS Bedrock (required)
     _aws_bedrock_client = AWSBedrockClient(
@@ -193,10 +212,12 @@ def setup_dependencies(app: FastAPI, settings: Settings) -> None:
         )
         
         # Initialize recommendation memory store for persistence
-        memory_store = RecommendationMemoryStore(
+        _memory_store = RecommendationMemoryStore(
             data_client=_mongodb_client,
-            embedding_client=embedding_client
+            embedding_client=embedding_client,
+            ttl_days=settings.memory_ttl_days
         )
+        memory_store = _memory_store
         
         logger.info("Memory system components initialized")
     else:
@@ -207,7 +228,11 @@ def setup_dependencies(app: FastAPI, settings: Settings) -> None:
     batch_config = BatchConfig(
         batch_size=int(os.getenv("BATCH_SIZE", "5")),  # Executives per batch
         max_parallel_batches=int(os.getenv("MAX_PARALLEL_BATCHES", "20")),  # Respect rate limits
-        enable_parallel=os.getenv("ENABLE_PARALLEL_BATCHES", "true").lower() == "true"
+        enable_parallel=os.getenv("ENABLE_PARALLEL_BATCHES", "true").lower() == "true",
+        use_uvloop=os.getenv("BATCH_USE_UVLOOP", "false").lower() == "true",  # Changes the process-wide loop policy
+        adaptive=os.getenv("BATCH_ADAPTIVE", "false").lower() == "true",  # Tune batch size from observed durations
+        coalesce_factor=int(os.getenv("BATCH_COALESCE_FACTOR", "1")),  # Batches per thread handoff
+        batch_timeout=float(os.getenv("BATCH_TIMEOUT")) if os.getenv("BATCH_TIMEOUT") else None  # Seconds per batch
     )
     
     logger.info(
@@ -216,7 +241,7 @@ def setup_dependencies(app: FastAPI, settings: Settings) -> None:
         f"parallel_enabled={batch_config.enable_parallel}"
     )
     
-    analysis_service = AnalysisService(
+    _analysis_service = AnalysisService(
         data_client=_mongodb_client,
         ai_client=_aws_bedrock_client,
         embedding_client=embedding_client,
@@ -227,7 +252,7 @@ def setup_dependencies(app: FastAPI, settings: Settings) -> None:
     )
     
     # Configure dependency injection for API routes
-    set_analysis_service(analysis_service)
+    set_analysis_service(_analysis_service)
     set_settings(settings)
     
     logger.info("Dependencies configured")
@@ -66,6 +66,10 @@ class AnalysisService:
             f"parallel={self._batch_processor._config.enable_parallel}"
         )
     
+    def shutdown(self) -> None:
+        """Release the batch worker threads without waiting for running batches."""
+        self._batch_processor.shutdown(wait=False)
+    
     def execute_analysis(
         self,
         query_params: Dict[str, Any],
@@ -312,16 +316,22 @@ class AnalysisService:
         # Step 7: Store new recommendations
         if self._memory_enabled and filtered_recs:
             logger.debug(f"Storing {len(filtered_recs)} filtered recommendations")
-            for rec in filtered_recs:
-                self._memory_store.store_recommendation(
-                    executive_id=executive_id,
-                    client_id=client_id,
-                    recommendation_text=rec.get("recommendation", ""),
-                    metadata={
-                        "status": rec.get("status", "new"),
-                        "previous_timestamp": rec.get("previous_timestamp")
-                    }
-                )
+            # Reuse the embeddings from step 5 and insert all documents at once
+            self._memory_store.store_recommendations(
+                [
+                    (
+                        executive_id,
+                        client_id,
+                        rec.get("recommendation", ""),
+                        {
+                            "status": rec.get("status", "new"),
+                            "previous_timestamp": rec.get("previous_timestamp")
+                        }
+                    )
+                    for rec in filtered_recs
+                ],
+                embeddings=[rec.get("embedding") for rec in filtered_recs]
+            )
         
         # Step 8: Return results with filtered recommendations
         analysis_result["recommendations"] = filtered_recs
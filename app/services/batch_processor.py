@@ -5,12 +5,22 @@ This service provides a scalable and extensible way to process large datasets
 by dividing them into smaller batches and processing them in parallel.
 """
 
+from __future__ import annotations
+
 import asyncio
+import functools
 import logging
-from typing import List, Dict, Any, Optional, Callable
+import threading
+import time
+from typing import Any, AsyncIterator, Callable, Iterable, Iterator
 from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 
+try:
+    import uvloop  # Installed with uvicorn[standard]
+except ImportError:
+    uvloop = None
+
 logger = logging.getLogger(__name__)
 
 
@@ -20,6 +30,16 @@ class BatchConfig:
     batch_size: int = 5  # Number of items per batch
     max_parallel_batches: int = 20  # Maximum concurrent batches (respects rate limits)
     enable_parallel: bool = True  # Enable/disable parallel processing
+    use_uvloop: bool = False  # Opt in to installing the uvloop event loop policy (process-global)
+    adaptive: bool = False  # Grow/shrink batch_size based on observed batch durations
+    min_batch_size: int = 1  # Lower bound for adaptive batch size
+    max_batch_size: int = 20  # Upper bound for adaptive batch size
+    target_duration_low: float = 20.0  # Grow batches when EWMA duration (s) is below this
+    target_duration_high: float = 90.0  # Shrink batches when EWMA duration (s) is above this
+    max_failure_rate: float = 0.2  # Shrink batches when this fraction of batches fails
+    coalesce_factor: int = 1  # Batches handed to the thread pool per executor call (parallel mode)
+    batch_timeout: float | None = None  # Max seconds per batch, counted from when a worker starts it
+    max_workers: int | None = None  # Worker threads shared by all runs (default: 2 * max_parallel_batches)
     
     def __post_init__(self):
         """Validate configuration."""
@@ -27,6 +47,19 @@ class BatchConfig:
             raise ValueError("batch_size must be positive")
         if self.max_parallel_batches <= 0:
             raise ValueError("max_parallel_batches must be positive")
+        if self.coalesce_factor <= 0:
+            raise ValueError("coalesce_factor must be positive")
+        if self.batch_timeout is not None and self.batch_timeout <= 0:
+            raise ValueError("batch_timeout must be positive")
+        if self.max_workers is not None and self.max_workers < self.max_parallel_batches:
+            raise ValueError("max_workers must be at least max_parallel_batches")
+        if self.adaptive:
+            if not 0 < self.min_batch_size <= self.batch_size <= self.max_batch_size:
+                raise ValueError("adaptive mode requires 0 < min_batch_size <= batch_size <= max_batch_size")
+            if not 0 <= self.target_duration_low < self.target_duration_high:
+                raise ValueError("target_duration_low must be lower than target_duration_high")
+            if not 0 <= self.max_failure_rate <= 1:
+                raise ValueError("max_failure_rate must be between 0 and 1")
 
 
 @dataclass
@@ -35,9 +68,9 @@ class BatchResult:
     batch_num: int
     success: bool
     data: Any = None
-    error: Optional[str] = None
+    error: str | None = None
     duration: float = 0.0
-    metadata: Optional[Dict[str, Any]] = None
+    metadata: dict[str, Any] | None = None
 
 
 class BatchProcessor:
@@ -56,7 +89,7 @@ class BatchProcessor:
     - Dependency Inversion: Depends on abstractions (callbacks) not implementations
     """
     
-    def __init__(self, config: Optional[BatchConfig] = None):
+    def __init__(self, config: BatchConfig | None = None):
         """
         Initialize batch processor.
         
@@ -65,23 +98,123 @@ class BatchProcessor:
         """
         self._config = config or BatchConfig()
         self._logger = logger
+        
+        # Worker threads are created lazily and reused across batches and runs;
+        # runs may come from several threads (one asyncio.run per request)
+        self._executor: ThreadPoolExecutor | None = None
+        self._executor_lock = threading.Lock()
+        
+        # Adaptive sizing state (only changes when config.adaptive is enabled)
+        self._batch_size = self._config.batch_size
+        self._duration_ewma: float | None = None
+        
+        if self._config.use_uvloop:
+            self._install_uvloop()
+    
+    def _install_uvloop(self) -> None:
+        """
+        Install uvloop as the event loop policy if it is available.
+        
+        The policy is process-global: every event loop created afterwards
+        (including the ones created by asyncio.run for batch processing) uses
+        uvloop. Loops that are already running are not affected.
+        """
+        if uvloop is None:
+            return
+        
+        if isinstance(asyncio.get_event_loop_policy(), uvloop.EventLoopPolicy):
+            return
+        
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+        self._logger.info("uvloop event loop policy installed for batch processing")
+    
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """
+        Return the shared thread pool used to run process_fn.
+        
+        The pool has more workers than the batches admitted at once (twice
+        max_parallel_batches by default). A batch that timed out keeps its
+        worker until process_fn returns, and concurrent runs share the pool,
+        so the spare workers keep admitted batches from queueing behind them.
+        """
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self._config.max_workers or 2 * self._config.max_parallel_batches,
+                    thread_name_prefix="batch"
+                )
+            return self._executor
+    
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Release the worker threads (called from the application shutdown).
+        
+        Batches still queued are cancelled; a later run creates a new pool.
+        
+        Args:
+            wait: If True, block until running batches finish
+        """
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+    
+    async def _run_in_worker(self, fn: Callable[[], Any], timeout: float | None) -> Any:
+        """
+        Run fn in the shared pool, applying timeout once a worker has picked it up.
+        
+        Time spent waiting in the executor queue (behind timed-out batches or
+        other runs) does not count towards the timeout.
+        
+        Raises:
+            asyncio.TimeoutError: If fn runs longer than timeout
+            RuntimeError: If shutdown() cancelled fn before a worker started it
+        """
+        loop = asyncio.get_running_loop()
+        started = asyncio.Event()
+        
+        def run():
+            loop.call_soon_threadsafe(started.set)
+            return fn()
+        
+        future = loop.run_in_executor(self._get_executor(), run)
+        started_task = asyncio.ensure_future(started.wait())
+        try:
+            # The future finishes first if shutdown() cancels the queued job
+            await asyncio.wait({future, started_task}, return_when=asyncio.FIRST_COMPLETED)
+        except asyncio.CancelledError:
+            # Still queued: drop it instead of running it for nobody
+            future.cancel()
+            raise
+        finally:
+            started_task.cancel()
+        
+        if not future.done():
+            return await asyncio.wait_for(future, timeout=timeout)
+        if future.cancelled():
+            raise RuntimeError("Batch cancelled: the worker pool was shut down")
+        return future.result()
+    
+    @property
+    def batch_size(self) -> int:
+        """Batch size used by the next call to divide_into_batches."""
+        return self._batch_size
     
-    def divide_into_batches(self, data: List[Any]) -> List[List[Any]]:
+    def divide_into_batches(self, data: Iterable[Any]) -> list[list[Any]]:
         """
         Divide data into batches of configured size.
         
         Args:
-            data: List of items to divide
+            data: Items to divide (non-list iterables are materialized once)
             
         Returns:
             List of batches, where each batch is a list of items
         """
-        batches = []
-        batch_size = self._config.batch_size
+        if not isinstance(data, list):
+            data = list(data)
         
-        for i in range(0, len(data), batch_size):
-            batch = data[i:i + batch_size]
-            batches.append(batch)
+        batch_size = self._batch_size
+        batches = [data[i:i + batch_size] for i in range(0, len(data), batch_size)]
         
         self._logger.info(
             f"Divided {len(data)} items into {len(batches)} batches "
@@ -90,18 +223,23 @@ class BatchProcessor:
         
         return batches
     
+    @staticmethod
+    def _count_batches(batches: Iterable[list[Any]]) -> int | str:
+        """Return the number of batches for logging, or "streaming" for lazy sources."""
+        return len(batches) if hasattr(batches, "__len__") else "streaming"
+    
     async def process_batches_async(
         self,
-        batches: List[List[Any]],
-        process_fn: Callable[[List[Any], int], Any],
+        batches: Iterable[list[Any]],
+        process_fn: Callable[[list[Any], int], Any],
         *args,
         **kwargs
-    ) -> List[BatchResult]:
+    ) -> list[BatchResult]:
         """
         Process batches asynchronously in parallel.
         
         Args:
-            batches: List of batches to process
+            batches: Batches to process (a list, or any iterable such as a generator)
             process_fn: Function to process each batch. Should accept (batch_data, batch_num, *args, **kwargs)
             *args: Additional positional arguments to pass to process_fn
             **kwargs: Additional keyword arguments to pass to process_fn
@@ -113,52 +251,212 @@ class BatchProcessor:
             return await self._process_batches_sequential(batches, process_fn, *args, **kwargs)
         
         self._logger.info(
-            f"Processing {len(batches)} batches in parallel "
+            f"Processing {self._count_batches(batches)} batches in parallel "
             f"(max concurrent: {self._config.max_parallel_batches})"
         )
         
-        # Create semaphore to limit concurrent batches
-        semaphore = asyncio.Semaphore(self._config.max_parallel_batches)
+        results = [
+            result
+            async for result in self.aiter_results(batches, process_fn, *args, **kwargs)
+        ]
+        
+        # Results arrive in completion order; restore batch order for consolidation
+        results.sort(key=lambda r: r.batch_num)
+        return results
+    
+    async def aiter_results(
+        self,
+        batches: Iterable[list[Any]],
+        process_fn: Callable[[list[Any], int], Any],
+        *args,
+        **kwargs
+    ) -> AsyncIterator[BatchResult]:
+        """
+        Process batches in parallel, yielding each result as soon as it completes.
+        
+        Unlike process_batches_async, results are not accumulated: consumers can
+        start consolidating or persisting a batch while slower batches are still
+        running. Results are yielded in completion order, not batch order.
+        
+        Batches are pulled from the source only when a slot frees up, so at
+        most max_parallel_batches executor calls (each one batch, or a group
+        of coalesce_factor batches) are in flight and a lazy source such as a
+        generator or cursor is never buffered ahead of them.
+        
+        Args:
+            batches: Batches to process (a list, or any iterable such as a generator)
+            process_fn: Function to process each batch. Should accept (batch_data, batch_num, *args, **kwargs)
+            *args: Additional positional arguments to pass to process_fn
+            **kwargs: Additional keyword arguments to pass to process_fn
+            
+        Yields:
+            BatchResult objects, one per batch
+        """
+        groups = self._group_batches(batches, self._effective_coalesce_factor())
+        max_in_flight = self._config.max_parallel_batches
+        pending: set[asyncio.Future] = set()
+        
+        try:
+            while True:
+                # Top up to the concurrency limit from the (possibly lazy) source
+                while len(pending) < max_in_flight:
+                    group = next(groups, None)
+                    if group is None:
+                        break
+                    pending.add(asyncio.ensure_future(
+                        self._process_group_safely(group, process_fn, args, kwargs)
+                    ))
+                
+                if not pending:
+                    break
+                
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    for result in task.result():
+                        yield result
+        finally:
+            # Consumer stopped early (break/cancel): don't leave batches running
+            for task in pending:
+                task.cancel()
+    
+    def _effective_coalesce_factor(self) -> int:
+        """
+        Number of batches to run per executor call.
         
-        async def process_with_semaphore(batch_data, batch_num):
-            """Process batch with semaphore to limit concurrency."""
-            async with semaphore:
-                return await self._process_single_batch_async(
+        Coalescing only pays off when batches are short. When adaptive sizing
+        has observed batches slower than target_duration_low, each batch gets
+        its own executor call so long batches keep running in parallel.
+        """
+        if (
+            self._duration_ewma is not None
+            and self._duration_ewma >= self._config.target_duration_low
+        ):
+            return 1
+        return self._config.coalesce_factor
+    
+    @staticmethod
+    def _group_batches(
+        batches: Iterable[list[Any]],
+        group_size: int
+    ) -> Iterator[list[tuple[list[Any], int]]]:
+        """Yield lists of (batch_data, batch_num) pairs with up to group_size items."""
+        group = []
+        for i, batch in enumerate(batches):
+            group.append((batch, i + 1))
+            if len(group) == group_size:
+                yield group
+                group = []
+        if group:
+            yield group
+    
+    async def _process_group_safely(
+        self,
+        group: list[tuple[list[Any], int]],
+        process_fn: Callable,
+        args: tuple,
+        kwargs: dict[str, Any]
+    ) -> list[BatchResult]:
+        """Process a group of batches, turning unexpected errors into failed results."""
+        try:
+            if len(group) == 1:
+                batch_data, batch_num = group[0]
+                return [await self._process_single_batch_async(
                     batch_data, batch_num, process_fn, *args, **kwargs
-                )
+                )]
+            return await self._process_group_async(group, process_fn, args, kwargs)
+        except Exception as e:
+            return [
+                BatchResult(batch_num=batch_num, success=False, error=str(e))
+                for _, batch_num in group
+            ]
+    
+    async def _process_group_async(
+        self,
+        group: list[tuple[list[Any], int]],
+        process_fn: Callable,
+        args: tuple,
+        kwargs: dict[str, Any]
+    ) -> list[BatchResult]:
+        """
+        Process several batches in a single executor call.
         
-        # Create tasks for all batches
-        tasks = [
-            process_with_semaphore(batch, i + 1)
-            for i, batch in enumerate(batches)
-        ]
+        The batches run one after another inside the worker thread, which
+        amortizes the thread handoff when process_fn is cheap.
+        On timeout, batches that already finished keep their results; the
+        others are reported as timed out and are not started.
+        
+        Args:
+            group: (batch_data, batch_num) pairs to process
+            process_fn: Function to process each batch
+            args: Additional positional arguments for process_fn
+            kwargs: Additional keyword arguments for process_fn
+            
+        Returns:
+            One BatchResult per batch in the group
+        """
+        timeout = self._config.batch_timeout
+        if timeout is not None:
+            timeout *= len(group)
+        
+        # Filled by the worker so a timeout only fails the batches left unfinished
+        completed: list[BatchResult] = []
+        abandoned = threading.Event()
+        
+        def run_group() -> list[BatchResult]:
+            for batch_data, batch_num in group:
+                if abandoned.is_set():
+                    break
+                completed.append(self._run_batch(batch_data, batch_num, process_fn, args, kwargs))
+            return completed
+        
+        try:
+            return await self._run_in_worker(run_group, timeout)
+        except asyncio.TimeoutError:
+            # Don't start the rest of the group once its results are discarded
+            abandoned.set()
+            finished = list(completed)
+            self._logger.error(
+                f"[Batches {group[0][1]}-{group[-1][1]}] ❌ Timed out after {timeout:.2f}s "
+                f"({len(finished)}/{len(group)} finished)"
+            )
+            return finished + [
+                BatchResult(batch_num=batch_num, success=False, error="timeout", duration=timeout)
+                for _, batch_num in group[len(finished):]
+            ]
+    
+    def _run_batch(
+        self,
+        batch_data: list[Any],
+        batch_num: int,
+        process_fn: Callable,
+        args: tuple,
+        kwargs: dict[str, Any]
+    ) -> BatchResult:
+        """Run process_fn for one batch synchronously and wrap the outcome."""
+        start_time = time.time()
+        
+        try:
+            result = process_fn(batch_data, batch_num, *args, **kwargs)
+        except Exception as e:
+            duration = time.time() - start_time
+            self._logger.error(
+                f"[Batch {batch_num}] ❌ Failed in {duration:.2f}s: {str(e)}"
+            )
+            return BatchResult(batch_num=batch_num, success=False, error=str(e), duration=duration)
         
-        # Execute all tasks in parallel (respecting semaphore limit)
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-        
-        # Convert exceptions to BatchResult objects
-        processed_results = []
-        for i, result in enumerate(results):
-            if isinstance(result, Exception):
-                processed_results.append(BatchResult(
-                    batch_num=i + 1,
-                    success=False,
-                    error=str(result)
-                ))
-            else:
-                processed_results.append(result)
-        
-        return processed_results
+        duration = time.time() - start_time
+        self._logger.info(f"[Batch {batch_num}] ✅ Completed in {duration:.2f}s")
+        return BatchResult(batch_num=batch_num, success=True, data=result, duration=duration)
     
     async def _process_batches_sequential(
         self,
-        batches: List[List[Any]],
-        process_fn: Callable[[List[Any], int], Any],
+        batches: Iterable[list[Any]],
+        process_fn: Callable[[list[Any], int], Any],
         *args,
         **kwargs
-    ) -> List[BatchResult]:
+    ) -> list[BatchResult]:
         """Process batches sequentially (fallback for non-parallel mode)."""
-        self._logger.info(f"Processing {len(batches)} batches sequentially")
+        self._logger.info(f"Processing {self._count_batches(batches)} batches sequentially")
         
         results = []
         for i, batch in enumerate(batches):
@@ -171,7 +469,7 @@ class BatchProcessor:
     
     async def _process_single_batch_async(
         self,
-        batch_data: List[Any],
+        batch_data: list[Any],
         batch_num: int,
         process_fn: Callable,
         *args,
@@ -188,21 +486,21 @@ class BatchProcessor:
             **kwargs: Additional keyword arguments for process_fn
             
         Returns:
-            BatchResult object
+            BatchResult object. If config.batch_timeout elapses after a worker
+            starts the batch, the result is marked failed with error "timeout"
+            and its concurrency slot is released. Python cannot interrupt the
+            worker thread, so process_fn keeps running in the background;
+            long-running implementations should check a cooperative cancel flag.
         """
-        import time
-        
         self._logger.debug(f"[Batch {batch_num}] Starting processing...")
         start_time = time.time()
         
+        # Run the synchronous process_fn in a thread pool to avoid blocking
         try:
-            # Run the synchronous process_fn in a thread pool to avoid blocking
-            loop = asyncio.get_event_loop()
-            with ThreadPoolExecutor(max_workers=1) as executor:
-                result = await loop.run_in_executor(
-                    executor,
-                    lambda: process_fn(batch_data, batch_num, *args, **kwargs)
-                )
+            result = await self._run_in_worker(
+                functools.partial(process_fn, batch_data, batch_num, *args, **kwargs),
+                self._config.batch_timeout
+            )
             
             duration = time.time() - start_time
             
@@ -217,6 +515,20 @@ class BatchProcessor:
                 duration=duration
             )
             
+        except asyncio.TimeoutError:
+            duration = time.time() - start_time
+            
+            self._logger.error(
+                f"[Batch {batch_num}] ❌ Timed out after {duration:.2f}s"
+            )
+            
+            return BatchResult(
+                batch_num=batch_num,
+                success=False,
+                error="timeout",
+                duration=duration
+            )
+            
         except Exception as e:
             duration = time.time() - start_time
             
@@ -233,9 +545,9 @@ class BatchProcessor:
     
     def consolidate_results(
         self,
-        results: List[BatchResult],
-        consolidate_fn: Optional[Callable[[List[Any]], Any]] = None
-    ) -> Dict[str, Any]:
+        results: list[BatchResult],
+        consolidate_fn: Callable[[list[Any]], Any] | None = None
+    ) -> dict[str, Any]:
         """
         Consolidate results from multiple batches.
         
@@ -271,6 +583,9 @@ class BatchProcessor:
         total_duration = sum(r.duration for r in results)
         avg_duration = total_duration / len(results) if results else 0
         
+        if self._config.adaptive:
+            self._update_policy(results, avg_duration)
+        
         return {
             "data": consolidated_data,
             "metadata": {
@@ -282,3 +597,38 @@ class BatchProcessor:
                 "failed_batch_numbers": [r.batch_num for r in failed]
             }
         }
+    
+    def _update_policy(self, results: list[BatchResult], avg_duration: float) -> None:
+        """
+        Adjust the batch size for the next run from the observed durations.
+        
+        Keeps an exponentially weighted moving average of the mean batch
+        duration. Batch size doubles while batches are fast and halves when
+        they are slow or too many of them fail (e.g. rate limiting), always
+        within [min_batch_size, max_batch_size].
+        
+        Args:
+            results: BatchResult objects from the last run
+            avg_duration: Mean duration of those batches in seconds
+        """
+        if not results:
+            return
+        
+        if self._duration_ewma is None:
+            self._duration_ewma = avg_duration
+        else:
+            self._duration_ewma = 0.8 * self._duration_ewma + 0.2 * avg_duration
+        
+        failure_rate = sum(1 for r in results if not r.success) / len(results)
+        previous_size = self._batch_size
+        
+        if failure_rate > self._config.max_failure_rate or self._duration_ewma > self._config.target_duration_high:
+            self._batch_size = max(self._config.min_batch_size, self._batch_size // 2)
+        elif self._duration_ewma < self._config.target_duration_low:
+            self._batch_size = min(self._config.max_batch_size, self._batch_size * 2)
+        
+        if self._batch_size != previous_size:
+            self._logger.info(
+                f"Adaptive batch size: {previous_size} -> {self._batch_size} "
+                f"(ewma: {self._duration_ewma:.2f}s, failure rate: {failure_rate:.0%})"
+            )
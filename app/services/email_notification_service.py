@@ -1,237 +1,121 @@
 """Email notification service for sending analysis results to ejecutivos."""
 
-from typing import Dict, Any, List
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Iterator, List, Tuple
+import hashlib
 import logging
+import math
+from operator import itemgetter
 from app.clients.email_client import IEmailClient
 
+# Stop a run early when the mail backend looks unhealthy: with at least
+# ABORT_MIN_EJECUTIVOS recipients, abort once a third of them have failed.
+ABORT_MIN_EJECUTIVOS = 30
+ABORT_ERROR = "batch aborted after >=1/3 failures"
 
-class EmailNotificationService:
-    """Service for sending email notifications after analysis."""
-    
-    def __init__(self, email_client: IEmailClient):
-        """
-        Initialize notification service.
-        
-        Args:
-            email_client: Implementation of IEmailClient
-            
-        Raises:
-            ValueError: If email_client is None
-        """
-        if email_client is None:
-            raise ValueError("email_client cannot be None")
-            
-        self._email_client = email_client
-        self._logger = logging.getLogger(__name__)
+# Prebuilt records for ejecutivos that are not sent to; copied with their name
+_UNSENT_RECORD = {"ejecutivo": None, "recipient": None, "subject": None}
+_ABORTED_RECORD = {**_UNSENT_RECORD, "status": "skipped", "error": ABORT_ERROR}
+_NO_TEST_CORREO_RECORD = {**_UNSENT_RECORD, "status": "skipped", "error": "Testing mode: no test_correo field"}
+_NO_EMAIL_RECORD = {**_UNSENT_RECORD, "status": "failed", "error": "No email address found"}
+
+# Email subject by testing mode
+_SUBJECT_TEMPLATES = {
+    False: "Reporte diario Coach Ejecutivo ({nombre})",
+    True: "[TEST] Reporte diario Coach Ejecutivo ({nombre})"
+}
+
+# Sugerencia card colors by priority (pastel backgrounds)
+_PRIORITY_STYLES = {
+    "CRÍTICA": {"border_color": "#dc3545", "bg_color": "#ffe6e6", "badge_bg": "#ffcccc", "badge_text": "#000000"},
+    "ALTA": {"border_color": "#ff8c00", "bg_color": "#fff4e6", "badge_bg": "#ffd699", "badge_text": "#000000"},
+    "MEDIA": {"border_color": "#ffc107", "bg_color": "#fffbf0", "badge_bg": "#ffe680", "badge_text": "#000000"}
+}
+
+
+def _classify_priority(prioridad: str) -> Tuple[str, Dict[str, str]]:
+    """Return the badge label and card style for a free-form priority."""
+    label = prioridad.upper()
+    if 'CRÍTICA' in label or 'CRITICA' in label:
+        return label, _PRIORITY_STYLES["CRÍTICA"]
+    if 'ALTA' in label:
+        return label, _PRIORITY_STYLES["ALTA"]
+    return label, _PRIORITY_STYLES["MEDIA"]
+
+
+# Precomputed (label, style) for the priorities the model normally returns,
+# in any common casing, so the hot loop does no case normalization
+_PRIORITY_LOOKUP = {
+    variant: _classify_priority(variant)
+    for name in ("CRÍTICA", "CRITICA", "ALTA", "MEDIA")
+    for variant in (name, name.lower(), name.capitalize())
+}
+
+
+def normalize_prioridad(prioridad: Any) -> Any:
+    """
+    Return the canonical upper-case label for a known priority.
     
-    def send_analysis_notifications(
-        self,
-        analysis_result: Dict[str, Any],
-        current_date: str,
-        is_testing: bool = False
-    ) -> Dict[str, Any]:
-        """
-        Send email notifications to all ejecutivos in analysis result.
-        
-        Args:
-            analysis_result: Result from analysis service
-            current_date: Current date for context
-            is_testing: If True, only send to ejecutivos with test_correo field
-            
-        Returns:
-            Dict with keys:
-                - total_sent: int
-                - total_failed: int
-                - total_skipped: int (only in testing mode)
-                - notifications: List[Dict] with details of each email
-        """
-        notifications = []
-        sent_count = 0
-        failed_count = 0
-        skipped_count = 0
-        
-        # Extract ejecutivos from analysis
-        data = analysis_result.get("data", {})
-        ejecutivos = data.get("ejecutivos", [])
-        
-        if not ejecutivos:
-            self._logger.warning("No ejecutivos found in analysis result")
-            return {
-                "total_sent": 0,
-                "total_failed": 0,
-                "total_skipped": 0,
-                "notifications": []
-            }
-        
-        # Log testing mode
-        if is_testing:
-            self._logger.info("TESTING MODE: Only sending to ejecutivos with test_correo field")
-        
-        # Send email to each ejecutivo
-        for ejecutivo in ejecutivos:
-            try:
-                # Extract ejecutivo data
-                correo = ejecutivo.get("correo")
-                test_correo = ejecutivo.get("test_correo")
-                nombre = ejecutivo.get("nombre", "Ejecutivo")
-                
-                # In testing mode, skip ejecutivos without test_correo
-                if is_testing and not test_correo:
-                    self._logger.info(f"Skipping {nombre} (no test_correo field)")
-                    notifications.append({
-                        "ejecutivo": nombre,
-                        "recipient": None,
-                        "subject": None,
-                        "status": "skipped",
-                        "error": "Testing mode: no test_correo field"
-                    })
-                    skipped_count += 1
-                    continue
-                
-                # Use test_correo if in testing mode, otherwise use regular correo
-                email_to_send = test_correo if is_testing else correo
-                
-                if not email_to_send:
-                    self._logger.warning(
-                        f"No email found for ejecutivo: {nombre}"
-                    )
-                    notifications.append({
-                        "ejecutivo": nombre,
-                        "recipient": None,
-                        "subject": None,
-                        "status": "failed",
-                        "error": "No email address found"
-                    })
-                    failed_count += 1
-                    continue
-                
-                # Format email
-                subject = f"Reporte diario Coach Ejecutivo ({nombre})"
-                if is_testing:
-                    subject = f"[TEST] {subject}"
-                
-                html_content = self._format_email_html(ejecutivo, current_date)
-                
-                # Send email
-                result = self._email_client.send_email(
-                    to_email=email_to_send,
-                    subject=subject,
-                    html_content=html_content
-                )
-                
-                # Record result
-                notification = {
-                    "ejecutivo": nombre,
-                    "recipient": result.get("recipient"),
-                    "original_recipient": result.get("original_recipient"),
-                    "test_mode": is_testing,
-                    "test_correo": test_correo if is_testing else None,
-                    "subject": subject,
-                    "body": html_content,
-                    "status": "success" if result["success"] else "failed",
-                    "status_code": result.get("status_code"),
-                    "error": None if result["success"] else result.get("message")
-                }
-                
-                notifications.append(notification)
-                
-                if result["success"]:
-                    sent_count += 1
-                else:
-                    failed_count += 1
-                    
-            except Exception as e:
-                self._logger.error(
-                    f"Unexpected error sending email to {nombre}: {str(e)}"
-                )
-                notifications.append({
-                    "ejecutivo": nombre,
-                    "recipient": correo if 'correo' in locals() else None,
-                    "subject": None,
-                    "status": "failed",
-                    "error": str(e)
-                })
-                failed_count += 1
-        
-        return {
-            "total_sent": sent_count,
-            "total_failed": failed_count,
-            "total_skipped": skipped_count,
-            "notifications": notifications
-        }
+    Used when storing recommendations so the memory collection holds a single
+    spelling (the API response keeps the model's value); unknown values are
+    returned unchanged.
+    """
+    entry = _PRIORITY_LOOKUP.get(prioridad) if isinstance(prioridad, str) else None
+    return entry[0] if entry else prioridad
+
+
+# Fields read from each ejecutivo, with the defaults used when a key is missing
+_EJECUTIVO_DEFAULTS = {
+    "nombre": "Ejecutivo",
+    "estado": "N/A",
+    "metricas": {},
+    "cartera": {},
+    "diagnostico": "",
+    "sugerencias_clientes": (),
+    "alertas": ()
+}
+_METRICAS_DEFAULTS = dict.fromkeys((
+    "ventas_acumuladas", "meta_mes", "faltante", "avance_porcentual", "avance_esperado",
+    "venta_diaria_actual", "venta_diaria_requerida", "dias_restantes"
+), 0)
+_CARTERA_DEFAULTS = dict.fromkeys((
+    "total_clientes", "clientes_activos", "clientes_riesgo_alto", "clientes_riesgo_medio",
+    "total_reclamos_cartera", "clientes_con_reclamos_activos", "tasa_cumplimiento_retiros",
+    "porcentaje_activacion"
+), 0)
+_get_ejecutivo_fields = itemgetter(*_EJECUTIVO_DEFAULTS)
+_get_metricas_fields = itemgetter(*_METRICAS_DEFAULTS)
+_get_cartera_fields = itemgetter(*_CARTERA_DEFAULTS)
+
+
+def _format_money(value: float) -> str:
+    """
+    Format an amount with thousands separators and no decimals.
     
-    def _format_email_html(
-        self,
-        ejecutivo: Dict[str, Any],
-        current_date: str
-    ) -> str:
-        """
-        Format ejecutivo data into HTML email content.
-        
-        Args:
-            ejecutivo: Dictionary with ejecutivo data
-            current_date: Current date string
-            
-        Returns:
-            HTML formatted email content
-        """
-        # Extract data
-        nombre = ejecutivo.get("nombre", "Ejecutivo")
-        estado = ejecutivo.get("estado", "N/A")
-        metricas = ejecutivo.get("metricas", {})
-        cartera = ejecutivo.get("cartera", {})
-        diagnostico = ejecutivo.get("diagnostico", "")
-        sugerencias = ejecutivo.get("sugerencias_clientes", [])
-        alertas = ejecutivo.get("alertas", [])
-        
-        # Format numbers
-        ventas = metricas.get("ventas_acumuladas", 0)
-        meta = metricas.get("meta_mes", 0)
-        faltante = metricas.get("faltante", 0)
-        avance_pct = metricas.get("avance_porcentual", 0)
-        avance_esperado = metricas.get("avance_esperado", 0)
-        venta_diaria_actual = metricas.get("venta_diaria_actual", 0)
-        venta_diaria_requerida = metricas.get("venta_diaria_requerida", 0)
-        dias_restantes = metricas.get("dias_restantes", 0)
-        
-        # Cartera metrics
-        total_clientes = cartera.get("total_clientes", 0)
-        clientes_activos = cartera.get("clientes_activos", 0)
-        clientes_riesgo_alto = cartera.get("clientes_riesgo_alto", 0)
-        clientes_riesgo_medio = cartera.get("clientes_riesgo_medio", 0)
-        total_reclamos = cartera.get("total_reclamos_cartera", 0)
-        reclamos_activos = cartera.get("clientes_con_reclamos_activos", 0)
-        tasa_retiros = cartera.get("tasa_cumplimiento_retiros", 0)
-        porcentaje_activacion = cartera.get("porcentaje_activacion", 0)
-        
-        # Determine status color and emoji
-        if "Excelente" in estado:
-            status_color = "#28a745"
-            status_emoji = "🟢"
-        elif "Buen" in estado:
-            status_color = "#17a2b8"
-            status_emoji = "🔵"
-        elif "justo" in estado:
-            status_color = "#ffc107"
-            status_emoji = "🟡"
-        else:
-            status_color = "#dc3545"
-            status_emoji = "🔴"
-        
-        # Progress bar
-        avance_pct = avance_pct or 0  # Handle None case
-        if avance_pct < 0.3:
-            progress_color = "#dc3545"
-        elif avance_pct < avance_esperado:
-            progress_color = "#ffc107"
-        else:
-            progress_color = "#28a745"
-        
-        progress_width = int(min(avance_pct * 100, 100))
-        progress_remaining = 100 - progress_width
-        
-        # Build HTML - Outlook compatible (ONLY inline styles, NO <style> tag)
-        html = f"""<!DOCTYPE html>
+    Matches "{:,.0f}" (half-even rounding), except that amounts rounding to
+    zero from below render as "0" instead of "-0".
+    """
+    if not math.isfinite(value):
+        # round() raises on NaN and infinities; "{:,.0f}" renders them as "nan"/"inf"
+        return "{:,.0f}".format(value)
+    return format(round(value), ",d")
+
+
+# Status badge (color, emoji) keyed by the keyword found in "estado";
+# keywords are checked in precedence order
+_STATUS_KEYWORDS = ("Excelente", "Buen", "justo")
+_STATUS_STYLE = {
+    "Excelente": ("#28a745", "🟢"),
+    "Buen": ("#17a2b8", "🔵"),
+    "justo": ("#ffc107", "🟡"),
+    None: ("#dc3545", "🔴")
+}
+
+# HTML templates, built once at import and filled with str.format per email.
+# Outlook compatible: ONLY inline styles, NO <style> tag.
+# _HTML_HEAD and _HTML_FOOTER are the same for every email and are never formatted.
+_HTML_HEAD = """<!DOCTYPE html>
 <html>
 <head><meta charset="UTF-8"></head>
 <body style="margin:0;padding:0;font-family:Arial,sans-serif;background-color:#f5f5f5;">
@@ -240,7 +124,9 @@ class EmailNotificationService:
 <table width="650" cellpadding="0" cellspacing="0" border="0" style="background-color:#ffffff;border:1px solid #cccccc;">
 <tr><td style="padding:25px 20px;text-align:center;border-bottom:4px solid #0056b3;">
 <h1 style="margin:0 0 10px 0;font-size:26px;font-weight:bold;color:#0056b3;">📊 Reporte Coach Ejecutivo</h1>
-<p style="margin:5px 0;font-size:16px;color:#000000;"><strong>{nombre}</strong></p>
+"""
+
+_EMAIL_BODY_TEMPLATE = """<p style="margin:5px 0;font-size:16px;color:#000000;"><strong>{nombre}</strong></p>
 <p style="margin:5px 0;font-size:14px;color:#666666;">{current_date}</p>
 </td></tr>
 <tr><td style="background-color:{status_color};color:#ffffff;padding:15px 20px;text-align:center;font-size:20px;font-weight:bold;">
@@ -253,17 +139,17 @@ class EmailNotificationService:
 <tr><td style="height:15px;"></td></tr>
 <tr><td style="background-color:#e3f2fd;padding:12px;border-left:4px solid #0056b3;">
 <div style="font-size:14px;color:#000000;font-weight:bold;margin-bottom:5px;">Ventas Acumuladas</div>
-<div style="font-size:22px;font-weight:bold;color:#000000;">${ventas:,.0f}</div>
+<div style="font-size:22px;font-weight:bold;color:#000000;">${ventas}</div>
 </td></tr>
 <tr><td style="height:12px;"></td></tr>
 <tr><td style="background-color:#e3f2fd;padding:12px;border-left:4px solid #0056b3;">
 <div style="font-size:14px;color:#000000;font-weight:bold;margin-bottom:5px;">Meta del Mes</div>
-<div style="font-size:22px;font-weight:bold;color:#000000;">${meta:,.0f}</div>
+<div style="font-size:22px;font-weight:bold;color:#000000;">${meta}</div>
 </td></tr>
 <tr><td style="height:12px;"></td></tr>
 <tr><td style="background-color:#e3f2fd;padding:12px;border-left:4px solid #0056b3;">
 <div style="font-size:14px;color:#000000;font-weight:bold;margin-bottom:5px;">Faltante</div>
-<div style="font-size:22px;font-weight:bold;color:#000000;">${faltante:,.0f}</div>
+<div style="font-size:22px;font-weight:bold;color:#000000;">${faltante}</div>
 </td></tr>
 <tr><td style="height:15px;"></td></tr>
 <tr><td>
@@ -277,12 +163,12 @@ class EmailNotificationService:
 <tr><td style="height:15px;"></td></tr>
 <tr><td style="background-color:#e3f2fd;padding:12px;border-left:4px solid #0056b3;">
 <div style="font-size:14px;color:#000000;font-weight:bold;margin-bottom:5px;">Venta Diaria Actual</div>
-<div style="font-size:22px;font-weight:bold;color:#000000;">${venta_diaria_actual:,.0f}</div>
+<div style="font-size:22px;font-weight:bold;color:#000000;">${venta_diaria_actual}</div>
 </td></tr>
 <tr><td style="height:12px;"></td></tr>
 <tr><td style="background-color:#e3f2fd;padding:12px;border-left:4px solid #0056b3;">
 <div style="font-size:14px;color:#000000;font-weight:bold;margin-bottom:5px;">Venta Diaria Requerida</div>
-<div style="font-size:22px;font-weight:bold;color:#000000;">${venta_diaria_requerida:,.0f}</div>
+<div style="font-size:22px;font-weight:bold;color:#000000;">${venta_diaria_requerida}</div>
 </td></tr>
 <tr><td style="height:12px;"></td></tr>
 <tr><td style="background-color:#e3f2fd;padding:12px;border-left:4px solid #0056b3;">
@@ -319,7 +205,7 @@ class EmailNotificationService:
 <div style="font-size:14px;color:#000000;font-weight:bold;margin-bottom:5px;">Total Reclamos</div>
 <div style="font-size:22px;font-weight:bold;color:#000000;">{total_reclamos}</div>
 </td></tr>
-{f'<tr><td style="height:12px;"></td></tr><tr><td style="background-color:#e8f5e9;padding:12px;border-left:4px solid #4caf50;"><div style="font-size:14px;color:#000000;font-weight:bold;margin-bottom:5px;">Tasa Cumplimiento Retiros</div><div style="font-size:22px;font-weight:bold;color:#000000;">{tasa_retiros*100:.1f}%</div></td></tr>' if tasa_retiros > 0 else ''}
+{tasa_retiros_row}
 </table>
 
 <table width="100%" cellpadding="0" cellspacing="0" border="0" style="margin-bottom:25px;">
@@ -332,34 +218,16 @@ class EmailNotificationService:
 <tr><td style="font-size:20px;font-weight:bold;color:#000000;padding-bottom:8px;border-bottom:3px solid #0056b3;">🎯 Acciones Prioritarias</td></tr>
 <tr><td style="height:15px;"></td></tr>
 """
-        
-        # Add sugerencias
-        if sugerencias:
-            for sug in sugerencias:
-                prioridad = sug.get('prioridad', 'MEDIA').upper()
-                cliente_nombre = sug.get('cliente_nombre', 'N/A')
-                cliente_rut = sug.get('cliente_rut', 'N/A')
-                accion = sug.get('accion', 'N/A')
-                razon = sug.get('razon', 'N/A')
-                
-                # Set colors based on priority (pastel backgrounds)
-                if 'CRÍTICA' in prioridad or 'CRITICA' in prioridad:
-                    border_color = "#dc3545"
-                    bg_color = "#ffe6e6"
-                    badge_bg = "#ffcccc"
-                    badge_text = "#000000"
-                elif 'ALTA' in prioridad:
-                    border_color = "#ff8c00"
-                    bg_color = "#fff4e6"
-                    badge_bg = "#ffd699"
-                    badge_text = "#000000"
-                else:  # MEDIA
-                    border_color = "#ffc107"
-                    bg_color = "#fffbf0"
-                    badge_bg = "#ffe680"
-                    badge_text = "#000000"
-                
-                html += f"""<tr><td style="background-color:{bg_color};border:2px solid {border_color};border-left:5px solid {border_color};padding:15px;margin-bottom:15px;">
+
+# One body template per status bucket, with its color and emoji baked in
+_EMAIL_BODY_TEMPLATES = {
+    bucket: _EMAIL_BODY_TEMPLATE.replace("{status_color}", color).replace("{status_emoji}", emoji)
+    for bucket, (color, emoji) in _STATUS_STYLE.items()
+}
+
+_TASA_RETIROS_ROW_TEMPLATE = '<tr><td style="height:12px;"></td></tr><tr><td style="background-color:#e8f5e9;padding:12px;border-left:4px solid #4caf50;"><div style="font-size:14px;color:#000000;font-weight:bold;margin-bottom:5px;">Tasa Cumplimiento Retiros</div><div style="font-size:22px;font-weight:bold;color:#000000;">{tasa_retiros_pct:.1f}%</div></td></tr>'
+
+_SUGERENCIA_TEMPLATE = """<tr><td style="background-color:{bg_color};border:2px solid {border_color};border-left:5px solid {border_color};padding:15px;margin-bottom:15px;">
 <div style="margin-bottom:10px;">
 <span style="background-color:{badge_bg};color:{badge_text};font-size:12px;font-weight:bold;padding:5px 10px;border-radius:3px;display:inline-block;">{prioridad}</span>
 </div>
@@ -370,27 +238,23 @@ class EmailNotificationService:
 </td></tr>
 <tr><td style="height:15px;"></td></tr>
 """
-        else:
-            html += """<tr><td style="background-color:#e1f5fe;padding:15px;border-left:4px solid #0288d1;font-size:15px;color:#000000;">No hay sugerencias en este momento.</td></tr>
+
+_NO_SUGERENCIAS_ROW = """<tr><td style="background-color:#e1f5fe;padding:15px;border-left:4px solid #0288d1;font-size:15px;color:#000000;">No hay sugerencias en este momento.</td></tr>
 """
-        
-        html += """</table>
+
+_TABLE_END = """</table>
 """
-        
-        # Add alertas
-        if alertas:
-            html += """<table width="100%" cellpadding="0" cellspacing="0" border="0" style="margin-bottom:25px;">
+
+_ALERTAS_HEADER = """<table width="100%" cellpadding="0" cellspacing="0" border="0" style="margin-bottom:25px;">
 <tr><td style="font-size:20px;font-weight:bold;color:#000000;padding-bottom:8px;border-bottom:3px solid #0056b3;">⚠️ Alertas Importantes</td></tr>
 <tr><td style="height:15px;"></td></tr>
 """
-            for alerta in alertas:
-                html += f"""<tr><td style="background-color:#fff3cd;border:2px solid #ffc107;border-left:5px solid #ffc107;padding:15px;margin:10px 0;font-size:14px;color:#000000;">{alerta}</td></tr>
+
+_ALERTA_TEMPLATE = """<tr><td style="background-color:#fff3cd;border:2px solid #ffc107;border-left:5px solid #ffc107;padding:15px;margin:10px 0;font-size:14px;color:#000000;">{alerta}</td></tr>
 <tr><td style="height:10px;"></td></tr>
 """
-            html += """</table>
-"""
-        
-        html += f"""</td></tr>
+
+_HTML_FOOTER = """</td></tr>
 <tr><td style="background-color:#f8f9fa;text-align:center;color:#666666;font-size:13px;padding:20px;border-top:1px solid #dee2e6;">
 <p style="margin:5px 0;color:#666666;"><strong>Coach Ejecutivo Chilexpress</strong></p>
 <p style="margin:5px 0;color:#666666;">Este es un reporte automático generado por el sistema de análisis de ventas</p>
@@ -402,5 +266,409 @@ class EmailNotificationService:
 </body>
 </html>
 """
+
+
+class EmailNotificationService:
+    """Service for sending email notifications after analysis."""
+    
+    def __init__(self, email_client: IEmailClient, max_workers: int = 1):
+        """
+        Initialize notification service.
+        
+        Args:
+            email_client: Implementation of IEmailClient
+            max_workers: Number of emails sent concurrently. Should not exceed
+                the client's connection pool size.
+            
+        Raises:
+            ValueError: If email_client is None or max_workers is not positive
+        """
+        if email_client is None:
+            raise ValueError("email_client cannot be None")
+        if max_workers <= 0:
+            raise ValueError("max_workers must be positive")
+            
+        self._email_client = email_client
+        self._max_workers = max_workers
+        self._logger = logging.getLogger(__name__)
+    
+    def send_analysis_notifications(
+        self,
+        analysis_result: Dict[str, Any],
+        current_date: str,
+        is_testing: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Send email notifications to all ejecutivos in analysis result.
+        
+        Args:
+            analysis_result: Result from analysis service
+            current_date: Current date for context
+            is_testing: If True, only send to ejecutivos with test_correo field
+            
+        Returns:
+            Dict with keys:
+                - total_sent: int
+                - total_failed: int
+                - total_skipped: int (only in testing mode)
+                - notifications: List[Dict] with details of each email
+        """
+        notifications = list(
+            self.iter_analysis_notifications(analysis_result, current_date, is_testing)
+        )
+        
+        return {
+            "total_sent": sum(1 for n in notifications if n["status"] == "success"),
+            "total_failed": sum(1 for n in notifications if n["status"] == "failed"),
+            "total_skipped": sum(1 for n in notifications if n["status"] == "skipped"),
+            "notifications": notifications
+        }
+    
+    def iter_analysis_notifications(
+        self,
+        analysis_result: Dict[str, Any],
+        current_date: str,
+        is_testing: bool = False
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Send email notifications, yielding each record as it is produced.
+        
+        The client session stays open until the generator is exhausted or
+        closed, so callers that only need progress or counters do not have
+        to hold every record in memory.
+        
+        Args:
+            analysis_result: Result from analysis service
+            current_date: Current date for context
+            is_testing: If True, only send to ejecutivos with test_correo field
+            
+        Yields:
+            Notification record for each ejecutivo, in ejecutivo order
+        """
+        # Extract ejecutivos from analysis
+        data = analysis_result.get("data", {})
+        ejecutivos = data.get("ejecutivos", [])
+        
+        if not ejecutivos:
+            self._logger.warning("No ejecutivos found in analysis result")
+            return
+        
+        # Log testing mode
+        if is_testing:
+            self._logger.info("TESTING MODE: Only sending to ejecutivos with test_correo field")
+        
+        # Send email to each ejecutivo over the client's shared connection(s)
+        with self._email_client.session():
+            yield from self._iter_send(ejecutivos, current_date, is_testing)
+    
+    async def send_analysis_notifications_async(
+        self,
+        analysis_result: Dict[str, Any],
+        current_date: str,
+        is_testing: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Send notifications without blocking the event loop.
+        
+        Runs send_analysis_notifications in a worker thread so async request
+        handlers keep serving while emails are delivered.
+        
+        Args:
+            analysis_result: Result from analysis service
+            current_date: Current date for context
+            is_testing: If True, only send to ejecutivos with test_correo field
+            
+        Returns:
+            Same dict as send_analysis_notifications
+        """
+        return await asyncio.to_thread(
+            self.send_analysis_notifications,
+            analysis_result,
+            current_date,
+            is_testing
+        )
+    
+    def _iter_send(
+        self,
+        ejecutivos: List[Dict[str, Any]],
+        current_date: str,
+        is_testing: bool
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield one notification record per ejecutivo."""
+        if self._max_workers > 1 and len(ejecutivos) > 1:
+            return self._iter_send_parallel(ejecutivos, current_date, is_testing)
+        return self._iter_send_sequential(ejecutivos, current_date, is_testing)
+    
+    def _iter_send_sequential(
+        self,
+        ejecutivos: List[Dict[str, Any]],
+        current_date: str,
+        is_testing: bool
+    ) -> Iterator[Dict[str, Any]]:
+        """Send one email after another, aborting if too many fail."""
+        failed_count = 0
+        
+        for index, ejecutivo in enumerate(ejecutivos):
+            notification = self._send_to_ejecutivo(ejecutivo, current_date, is_testing)
+            yield notification
+            if notification["status"] == "failed":
+                failed_count += 1
+                if self._should_abort(failed_count, len(ejecutivos)):
+                    yield from self._iter_aborted(ejecutivos[index + 1:], failed_count, len(ejecutivos))
+                    return
+    
+    def _iter_send_parallel(
+        self,
+        ejecutivos: List[Dict[str, Any]],
+        current_date: str,
+        is_testing: bool
+    ) -> Iterator[Dict[str, Any]]:
+        """Send emails concurrently, cancelling pending sends if too many fail."""
+        failed_count = 0
+        
+        with ThreadPoolExecutor(max_workers=self._max_workers) as executor:
+            futures = [
+                executor.submit(self._send_to_ejecutivo, ejecutivo, current_date, is_testing)
+                for ejecutivo in ejecutivos
+            ]
+            try:
+                for index, future in enumerate(futures):
+                    notification = future.result()
+                    yield notification
+                    if notification["status"] == "failed":
+                        failed_count += 1
+                        if self._should_abort(failed_count, len(ejecutivos)):
+                            # Queued sends are cancelled; sends already in flight
+                            # (always the next ones, the executor is FIFO) finish
+                            in_flight = [f for f in futures[index + 1:] if not f.cancel()]
+                            for pending in in_flight:
+                                yield pending.result()
+                            remaining = ejecutivos[index + 1 + len(in_flight):]
+                            yield from self._iter_aborted(remaining, failed_count, len(ejecutivos))
+                            return
+            finally:
+                # Stop queued sends if the caller closes the generator early
+                for future in futures:
+                    future.cancel()
+    
+    @staticmethod
+    def _should_abort(failed_count: int, total: int) -> bool:
+        """Return True when at least a third of a large run has failed."""
+        return total >= ABORT_MIN_EJECUTIVOS and failed_count * 3 >= total
+    
+    def _iter_aborted(
+        self,
+        remaining: List[Dict[str, Any]],
+        failed_count: int,
+        total: int
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield skipped records for ejecutivos not attempted after an abort."""
+        if remaining:
+            self._logger.error(
+                "Aborting notifications: %d of %d failed, skipping %d",
+                failed_count, total, len(remaining)
+            )
+        for ejecutivo in remaining:
+            yield {**_ABORTED_RECORD, "ejecutivo": ejecutivo.get("nombre", "Ejecutivo")}
+    
+    def _send_to_ejecutivo(
+        self,
+        ejecutivo: Dict[str, Any],
+        current_date: str,
+        is_testing: bool
+    ) -> Dict[str, Any]:
+        """
+        Format and send the notification email for a single ejecutivo.
+        
+        Args:
+            ejecutivo: Dictionary with ejecutivo data
+            current_date: Current date string
+            is_testing: If True, only send when the ejecutivo has test_correo
+            
+        Returns:
+            Notification record with "status" set to success, failed or skipped
+        """
+        # Extract ejecutivo data
+        correo = ejecutivo.get("correo")
+        test_correo = ejecutivo.get("test_correo")
+        nombre = ejecutivo.get("nombre", "Ejecutivo")
+        
+        try:
+            # In testing mode, skip ejecutivos without test_correo
+            if is_testing and not test_correo:
+                self._logger.info("Skipping %s (no test_correo field)", nombre)
+                return {**_NO_TEST_CORREO_RECORD, "ejecutivo": nombre}
+            
+            # Use test_correo if in testing mode, otherwise use regular correo
+            email_to_send = test_correo if is_testing else correo
+            
+            if not email_to_send:
+                self._logger.warning("No email found for ejecutivo: %s", nombre)
+                return {**_NO_EMAIL_RECORD, "ejecutivo": nombre}
+            
+            # Rendering is only reached for ejecutivos that will be sent to
+            subject = _SUBJECT_TEMPLATES[is_testing].format(nombre=nombre)
+            
+            html_content = self._format_email_html(ejecutivo, current_date)
+            
+            # Send email
+            result = self._email_client.send_email(
+                to_email=email_to_send,
+                subject=subject,
+                html_content=html_content
+            )
+            
+            # Record result
+            return {
+                "ejecutivo": nombre,
+                "recipient": result.get("recipient"),
+                "original_recipient": result.get("original_recipient"),
+                "test_mode": is_testing,
+                "test_correo": test_correo if is_testing else None,
+                "subject": subject,
+                "body_sha1": hashlib.sha1(html_content.encode("utf-8")).hexdigest(),
+                "status": "success" if result["success"] else "failed",
+                "status_code": result.get("status_code"),
+                "error": None if result["success"] else result.get("message")
+            }
+            
+        except Exception as e:
+            self._logger.error("Unexpected error sending email to %s: %s", nombre, e)
+            return {
+                "ejecutivo": nombre,
+                "recipient": correo,
+                "subject": None,
+                "status": "failed",
+                "error": str(e)
+            }
+    
+    @staticmethod
+    def _format_email_html(
+        ejecutivo: Dict[str, Any],
+        current_date: str
+    ) -> str:
+        """
+        Format ejecutivo data into HTML email content.
+        
+        Args:
+            ejecutivo: Dictionary with ejecutivo data
+            current_date: Current date string
+            
+        Returns:
+            HTML formatted email content
+        """
+        # Extract data (defaults merged first so every key exists)
+        (
+            nombre, estado, metricas, cartera, diagnostico, sugerencias, alertas
+        ) = _get_ejecutivo_fields({**_EJECUTIVO_DEFAULTS, **ejecutivo})
+        
+        # Format numbers
+        (
+            ventas, meta, faltante, avance_pct, avance_esperado,
+            venta_diaria_actual, venta_diaria_requerida, dias_restantes
+        ) = _get_metricas_fields({**_METRICAS_DEFAULTS, **metricas})
+        
+        # Cartera metrics
+        (
+            total_clientes, clientes_activos, clientes_riesgo_alto, clientes_riesgo_medio,
+            total_reclamos, reclamos_activos, tasa_retiros, porcentaje_activacion
+        ) = _get_cartera_fields({**_CARTERA_DEFAULTS, **cartera})
+        
+        # Pick the body template with the status color and emoji baked in
+        status = next((keyword for keyword in _STATUS_KEYWORDS if keyword in estado), None)
+        body_template = _EMAIL_BODY_TEMPLATES[status]
+        
+        # Progress bar
+        avance_pct = avance_pct or 0  # Handle None case
+        if avance_pct < 0.3:
+            progress_color = "#dc3545"
+        elif avance_pct < avance_esperado:
+            progress_color = "#ffc107"
+        else:
+            progress_color = "#28a745"
+        
+        progress_width = int(min(avance_pct * 100, 100))
+        progress_remaining = 100 - progress_width
+        
+        # Build HTML
+        tasa_retiros_row = (
+            _TASA_RETIROS_ROW_TEMPLATE.format(tasa_retiros_pct=tasa_retiros * 100)
+            if tasa_retiros > 0 else ''
+        )
+        # An explicit null from the model renders like a missing list
+        sugerencias = sugerencias or ()
+        alertas = alertas or ()
+        
+        # Preallocate one slot per section: head, body, sugerencias (or the
+        # placeholder), end of table, optional alertas block and footer
+        size = 4 + max(len(sugerencias), 1) + (len(alertas) + 2 if alertas else 0)
+        parts: List[str] = [""] * size
+        parts[0] = _HTML_HEAD
+        parts[1] = body_template.format(
+            nombre=nombre,
+            current_date=current_date,
+            estado=estado,
+            ventas=_format_money(ventas),
+            meta=_format_money(meta),
+            faltante=_format_money(faltante),
+            progress_width=progress_width,
+            progress_remaining=progress_remaining,
+            progress_color=progress_color,
+            avance_pct=avance_pct,
+            venta_diaria_actual=_format_money(venta_diaria_actual),
+            venta_diaria_requerida=_format_money(venta_diaria_requerida),
+            dias_restantes=dias_restantes,
+            total_clientes=total_clientes,
+            clientes_activos=clientes_activos,
+            porcentaje_activacion=porcentaje_activacion,
+            clientes_riesgo_alto=clientes_riesgo_alto,
+            clientes_riesgo_medio=clientes_riesgo_medio,
+            reclamos_activos=reclamos_activos,
+            total_reclamos=total_reclamos,
+            tasa_retiros_row=tasa_retiros_row,
+            diagnostico=diagnostico
+        )
+        idx = 2
+        
+        # Add sugerencias
+        if sugerencias:
+            for sug in sugerencias:
+                # Set colors based on priority (pastel backgrounds)
+                raw_prioridad = sug.get('prioridad', 'MEDIA')
+                prioridad, priority_style = (
+                    _PRIORITY_LOOKUP.get(raw_prioridad) or _classify_priority(raw_prioridad)
+                )
+                cliente_nombre = sug.get('cliente_nombre', 'N/A')
+                cliente_rut = sug.get('cliente_rut', 'N/A')
+                accion = sug.get('accion', 'N/A')
+                razon = sug.get('razon', 'N/A')
+                
+                parts[idx] = _SUGERENCIA_TEMPLATE.format(
+                    prioridad=prioridad,
+                    cliente_nombre=cliente_nombre,
+                    cliente_rut=cliente_rut,
+                    accion=accion,
+                    razon=razon,
+                    **priority_style
+                )
+                idx += 1
+        else:
+            parts[idx] = _NO_SUGERENCIAS_ROW
+            idx += 1
+        
+        parts[idx] = _TABLE_END
+        idx += 1
+        
+        # Add alertas
+        if alertas:
+            parts[idx] = _ALERTAS_HEADER
+            idx += 1
+            for alerta in alertas:
+                parts[idx] = _ALERTA_TEMPLATE.format(alerta=alerta)
+                idx += 1
+            parts[idx] = _TABLE_END
+            idx += 1
+        
+        parts[idx] = _HTML_FOOTER
         
-        return html
+        return "".join(parts)
@@ -36,6 +36,7 @@ class MemoryResetService:
     Attributes:
         _memory_store: Instance of RecommendationMemoryStore for memory operations
         _mongodb_client: MongoDB client for direct database access
+        _collection: memory_embeddings collection handle, resolved on first use
     """
     
     def __init__(self, memory_store, mongodb_client):
@@ -55,6 +56,18 @@ class MemoryResetService:
             
         self._memory_store = memory_store
         self._mongodb_client = mongodb_client
+        self._collection_handle = None
+    
+    @property
+    def _collection(self):
+        """memory_embeddings collection, looked up once per service instance.
+        
+        Resolved lazily so a disconnected client fails inside the helpers'
+        error handling rather than in __init__.
+        """
+        if self._collection_handle is None:
+            self._collection_handle = self._mongodb_client._database['memory_embeddings']
+        return self._collection_handle
     
     def check_and_reset_if_needed(
         self,
@@ -143,20 +156,18 @@ class MemoryResetService:
             f"Executing PARTIAL RESET"
         )
         
-        # Get recently recommended clients sorted by timestamp (oldest first)
+        # Get only the oldest recently recommended clients we need to free
         recommended_clients = self._get_recommended_clients_sorted(
             executive_id,
             days_threshold,
-            reference_date
+            reference_date,
+            limit=clients_needed
         )
         
-        # Calculate how many embeddings to delete to free up clients
-        embeddings_to_delete = clients_needed
-        
         # Delete the oldest embeddings to free up clients
         deleted_count = self._delete_oldest_embeddings(
             executive_id,
-            recommended_clients[:embeddings_to_delete]
+            recommended_clients
         )
         
         return {
@@ -186,11 +197,8 @@ class MemoryResetService:
             >>> print(f"Deleted {count} embeddings")
         """
         try:
-            # Access memory_embeddings collection directly
-            collection = self._mongodb_client._database['memory_embeddings']
-            
             # Delete all embeddings for this executive
-            result = collection.delete_many({"executive_id": str(executive_id)})
+            result = self._collection.delete_many({"executive_id": str(executive_id)})
             
             deleted_count = result.deleted_count
             logger.info(f"Deleted {deleted_count} embeddings for executive {executive_id}")
@@ -203,7 +211,8 @@ class MemoryResetService:
         self,
         executive_id: str,
         days_threshold: int,
-        reference_date: Optional[str] = None
+        reference_date: Optional[str] = None,
+        limit: Optional[int] = None
     ) -> List[Dict[str, Any]]:
         """Get recently recommended clients sorted by timestamp (oldest first).
         
@@ -214,6 +223,7 @@ class MemoryResetService:
             executive_id: ID of the executive
             days_threshold: Cooldown period in days
             reference_date: Reference date for filtering (ISO format string)
+            limit: Optional maximum number of clients to return (applied server-side)
             
         Returns:
             List of client dictionaries with timestamps, sorted by age:
@@ -240,13 +250,12 @@ class MemoryResetService:
             cutoff_date = ref_dt - timedelta(days=days_threshold)
             cutoff_str = cutoff_date.isoformat()
             
-            # Access memory_embeddings collection
-            collection = self._mongodb_client._database['memory_embeddings']
-            
             # Aggregation pipeline to find recent recommendations
             pipeline = [
                 # Filter: executive's recommendations within cooldown period
                 {"$match": {"executive_id": str(executive_id), "timestamp": {"$gt": cutoff_str}}},
+                # Keep only the indexed fields so the scan is covered and embeddings are never read
+                {"$project": {"_id": 0, "client_id": 1, "timestamp": 1}},
                 # Sort by timestamp (oldest first)
                 {"$sort": {"timestamp": 1}},
                 # Group by client_id to get unique clients
@@ -255,10 +264,14 @@ class MemoryResetService:
                     "client_id": {"$first": "$client_id"},
                     "oldest_timestamp": {"$first": "$timestamp"},
                     "count": {"$sum": 1}
-                }}
+                }},
+                # $group does not keep input order, so sort the groups themselves
+                {"$sort": {"oldest_timestamp": 1, "_id": 1}}
             ]
+            if limit is not None:
+                pipeline.append({"$limit": limit})
             
-            results = list(collection.aggregate(pipeline))
+            results = list(self._collection.aggregate(pipeline))
             logger.info(f"Found {len(results)} recently recommended clients for executive {executive_id}")
             return results
         except Exception as e:
@@ -291,14 +304,11 @@ class MemoryResetService:
             return 0
         
         try:
-            # Access memory_embeddings collection
-            collection = self._mongodb_client._database['memory_embeddings']
-            
             # Extract client IDs from the list
             client_ids = [c['client_id'] for c in clients_to_free]
             
             # Delete embeddings for these specific clients
-            result = collection.delete_many({
+            result = self._collection.delete_many({
                 "executive_id": str(executive_id),
                 "client_id": {"$in": client_ids}
             })
@@ -1,36 +1,86 @@
 """Recommendation memory store for managing storage and retrieval of recommendations with embeddings."""
 
 import logging
+import random
 import time
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple, Callable
 from datetime import datetime, timedelta
+
+import numpy as np
+
 from app.clients.interfaces import IDataClient, IEmbeddingClient
+from app.services.similarity_service import quantize_embedding
 
 logger = logging.getLogger(__name__)
 
 
+def _encode_embedding(embedding: List[float]) -> bytes:
+    """Pack an embedding as float32 bytes (stored by MongoDB as BSON Binary)."""
+    return np.asarray(embedding, dtype=np.float32).tobytes()
+
+
+def _decode_embedding(stored: Any) -> Any:
+    """Unpack a stored embedding; documents written as BSON arrays are returned as is."""
+    if isinstance(stored, bytes):
+        return np.frombuffer(stored, dtype=np.float32)
+    return stored
+
+
 class RecommendationMemoryStore:
     """Manages storage and retrieval of recommendations with embeddings."""
     
-    def __init__(self, data_client: IDataClient, embedding_client: IEmbeddingClient):
+    def __init__(
+        self,
+        data_client: IDataClient,
+        embedding_client: IEmbeddingClient,
+        ttl_days: int = 0
+    ):
         """Initialize the recommendation memory store.
         
         Args:
             data_client: Client for MongoDB operations
             embedding_client: Client for generating embeddings
+            ttl_days: Days before MongoDB expires stored recommendations (0 keeps them)
             
         Raises:
-            ValueError: If either client is None
+            ValueError: If either client is None or ttl_days is negative
         """
         if data_client is None:
             raise ValueError("data_client cannot be None")
         if embedding_client is None:
             raise ValueError("embedding_client cannot be None")
+        if ttl_days < 0:
+            raise ValueError("ttl_days cannot be negative")
             
         self._data_client = data_client
         self._embedding_client = embedding_client
+        self._ttl_days = ttl_days
         self._collection_name = "memory_embeddings"  # Exclusive collection for memory system
-        logger.info(f"RecommendationMemoryStore initialized (collection: {self._collection_name})")
+        logger.info(f"RecommendationMemoryStore initialized (collection: {self._collection_name}, ttl_days: {ttl_days})")
+    
+    def ensure_indexes(self) -> None:
+        """Create the indexes used by the memory system.
+        
+        The compound index on (executive_id, client_id, timestamp) serves the
+        history lookups and the per-executive deletes through its prefixes;
+        (executive_id, timestamp, client_id) covers the reset aggregation,
+        which ranges on timestamp and reads only client_id. With ttl_days set, a TTL index on the BSON Date
+        ``created_at`` field lets MongoDB purge expired recommendations in the
+        background. Index errors are logged and do not prevent startup.
+        """
+        indexes = [
+            ([("executive_id", 1), ("client_id", 1), ("timestamp", -1)], {}),
+            ([("executive_id", 1), ("timestamp", 1), ("client_id", 1)], {})
+        ]
+        if self._ttl_days:
+            indexes.append(([("created_at", 1)], {"expireAfterSeconds": self._ttl_days * 86400}))
+        
+        for keys, options in indexes:
+            try:
+                name = self._data_client.create_index(self._collection_name, keys, **options)
+                logger.info(f"Index ensured on {self._collection_name}: {name}")
+            except Exception as e:
+                logger.warning(f"Could not create index {keys} on {self._collection_name}: {str(e)}")
     
     def store_recommendation(
         self,
@@ -54,41 +104,153 @@ class RecommendationMemoryStore:
             ValueError: If required parameters are invalid
             ConnectionError: If storage fails after retries
         """
+        self._validate_item(executive_id, client_id, recommendation_text)
+        
+        # Generate embedding
+        logger.debug(f"Generating embedding for recommendation (executive: {executive_id}, client: {client_id})")
+        embedding = self._embedding_client.generate_embedding(recommendation_text)
+        logger.debug(f"Embedding generated successfully (dimension: {len(embedding)})")
+        
+        doc = self._build_document(executive_id, client_id, recommendation_text, embedding, metadata, datetime.utcnow())
+        
+        result_id = self._with_retries(lambda: self._data_client.insert_one(self._collection_name, doc))
+        logger.info(f"Recommendation stored successfully (id: {result_id}, executive: {executive_id}, client: {client_id})")
+        return result_id
+    
+    def store_recommendations(
+        self,
+        items: List[Tuple[str, str, str, Optional[Dict[str, Any]]]],
+        embeddings: Optional[List[Optional[List[float]]]] = None
+    ) -> List[str]:
+        """Store several recommendations with one embedding call and one insert.
+        
+        Args:
+            items: (executive_id, client_id, recommendation_text, metadata) tuples
+            embeddings: Optional precomputed embeddings aligned with items; missing
+                entries are generated in a single batch call
+            
+        Returns:
+            IDs of the stored recommendations, in item order. If the batch insert
+            fails after retries, the documents are inserted one by one and only
+            the ones that succeed are returned
+            
+        Raises:
+            ValueError: If any item is invalid or embeddings do not match items
+            ConnectionError: If no recommendation could be stored
+        """
+        if not items:
+            return []
+        
+        for executive_id, client_id, recommendation_text, _ in items:
+            self._validate_item(executive_id, client_id, recommendation_text)
+        
+        if embeddings is None:
+            embeddings = [None] * len(items)
+        if len(embeddings) != len(items):
+            raise ValueError("embeddings must have one entry per item")
+        
+        embeddings = list(embeddings)
+        missing = [i for i, embedding in enumerate(embeddings) if embedding is None]
+        if missing:
+            logger.debug(f"Generating {len(missing)} embeddings in batch")
+            generated = self._embedding_client.generate_embeddings_batch([items[i][2] for i in missing])
+            for i, embedding in zip(missing, generated):
+                embeddings[i] = embedding
+        
+        now = datetime.utcnow()
+        docs = [
+            self._build_document(executive_id, client_id, recommendation_text, embedding, metadata, now)
+            for (executive_id, client_id, recommendation_text, metadata), embedding in zip(items, embeddings)
+        ]
+        
+        try:
+            result_ids = self._with_retries(lambda: self._data_client.insert_many(self._collection_name, docs))
+        except ConnectionError as e:
+            logger.warning(f"Batch store failed, storing recommendations one by one: {str(e)}")
+            return self._store_individually(docs)
+        logger.info(f"Stored {len(result_ids)} recommendations in one batch")
+        return result_ids
+    
+    def _store_individually(self, docs: List[Dict[str, Any]]) -> List[str]:
+        """Insert documents one at a time after a failed batch insert.
+        
+        The driver assigns "_id" to each document in place, so documents already
+        written by the failed batch are rejected as duplicates instead of being
+        stored twice; they are logged and left out of the returned IDs.
+        
+        Raises:
+            ConnectionError: If no document could be stored
+        """
+        result_ids = []
+        last_error = None
+        for doc in docs:
+            try:
+                result_ids.append(self._data_client.insert_one(self._collection_name, doc))
+            except Exception as e:
+                last_error = e
+                logger.error(f"Failed to store recommendation for executive {doc.get('executive_id')}, client {doc.get('client_id')}: {str(e)}")
+        
+        if not result_ids:
+            raise ConnectionError(f"Failed to store recommendations: {str(last_error)}")
+        
+        logger.info(f"Stored {len(result_ids)} of {len(docs)} recommendations individually")
+        return result_ids
+    
+    @staticmethod
+    def _validate_item(executive_id: str, client_id: str, recommendation_text: str) -> None:
+        """Raise ValueError if a recommendation cannot be stored."""
         if not executive_id:
             raise ValueError("executive_id cannot be empty")
         if not client_id:
             raise ValueError("client_id cannot be empty")
         if not recommendation_text or not recommendation_text.strip():
             raise ValueError("recommendation_text cannot be empty")
+    
+    @staticmethod
+    def _build_document(
+        executive_id: str,
+        client_id: str,
+        recommendation_text: str,
+        embedding: List[float],
+        metadata: Optional[Dict[str, Any]],
+        now: datetime
+    ) -> Dict[str, Any]:
+        """Build a memory_embeddings document.
         
-        # Generate embedding
-        logger.debug(f"Generating embedding for recommendation (executive: {executive_id}, client: {client_id})")
-        embedding = self._embedding_client.generate_embedding(recommendation_text)
-        logger.debug(f"Embedding generated successfully (dimension: {len(embedding)})")
-        
-        # Prepare document for memory_embeddings collection
-        doc = {
+        The embedding is packed as float32 BSON Binary (4 bytes per component
+        instead of a 9-byte BSON double). The int8 codes are used to screen
+        similarity; the float embedding confirms candidate matches. "timestamp"
+        stays an ISO string for existing readers; "created_at" is a BSON Date
+        so the TTL index can expire the document.
+        """
+        return {
             "executive_id": executive_id,
             "client_id": client_id,
             "recommendation": recommendation_text,
-            "embedding": embedding,
-            "timestamp": datetime.utcnow().isoformat(),
+            "embedding": _encode_embedding(embedding),
+            "embedding_int8": quantize_embedding(embedding).tobytes(),
+            "timestamp": now.isoformat(),
+            "created_at": now,
             "metadata": metadata or {}
         }
+    
+    @staticmethod
+    def _with_retries(operation: Callable[[], Any], max_retries: int = 3) -> Any:
+        """Run a storage operation, retrying with jittered exponential backoff.
         
-        # Store in MongoDB with retry logic
-        max_retries = 3
+        Raises:
+            ConnectionError: If the operation fails max_retries times
+        """
         for attempt in range(max_retries):
             try:
                 logger.debug(f"Storing recommendation (attempt {attempt + 1}/{max_retries})")
-                result_id = self._data_client.insert_one(self._collection_name, doc)
-                logger.info(f"Recommendation stored successfully (id: {result_id}, executive: {executive_id}, client: {client_id})")
-                return result_id
+                return operation()
             except Exception as e:
                 if attempt == max_retries - 1:
                     raise ConnectionError(f"Failed to store recommendation after {max_retries} attempts: {str(e)}")
-                wait_time = 2 ** attempt
-                logger.warning(f"Storage attempt {attempt + 1} failed, retrying in {wait_time}s: {str(e)}")
+                # Jitter keeps concurrent writers from retrying in lockstep
+                wait_time = 2 ** attempt * random.uniform(0.5, 1.0)
+                logger.warning(f"Storage attempt {attempt + 1} failed, retrying in {wait_time:.1f}s: {str(e)}")
                 time.sleep(wait_time)
     
     def get_historical_recommendations(
@@ -107,7 +269,8 @@ class RecommendationMemoryStore:
             limit: Optional maximum number of recommendations to return
             
         Returns:
-            List of recommendation documents with embeddings, ordered by timestamp (newest first)
+            List of recommendation documents with embeddings (NumPy float32 arrays
+            for packed documents), ordered by timestamp (newest first)
             
         Raises:
             ValueError: If parameters are invalid
@@ -135,7 +298,8 @@ class RecommendationMemoryStore:
         query_params = {
             "collection": self._collection_name,
             "filter": filter_doc,
-            "projection": None  # Return all fields including embedding
+            "projection": None,  # Return all fields including embedding
+            "sort": [("timestamp", -1)]  # Newest first, so limit keeps the latest
         }
         
         if limit is not None:
@@ -146,9 +310,9 @@ class RecommendationMemoryStore:
         try:
             logger.debug(f"Retrieving historical recommendations (executive: {executive_id}, client: {client_id}, days_back: {days_back}, limit: {limit})")
             results = self._data_client.query(query_params)
-            
-            # Sort by timestamp descending (newest first)
-            results.sort(key=lambda x: x.get("timestamp", ""), reverse=True)
+            for doc in results:
+                if "embedding" in doc:
+                    doc["embedding"] = _decode_embedding(doc["embedding"])
             
             logger.info(f"Retrieved {len(results)} historical recommendations (executive: {executive_id}, client: {client_id})")
             return results
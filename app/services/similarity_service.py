@@ -1,12 +1,47 @@
 """Service for computing semantic similarity and applying cooldown logic."""
 
 import logging
-import math
-from typing import List, Dict, Any, Tuple, Optional
+from typing import List, Dict, Any, Tuple, Optional, Sequence, Union
 from datetime import datetime, timedelta
 
+import numpy as np
+
 logger = logging.getLogger(__name__)
 
+# Embeddings may arrive as plain lists (from JSON/MongoDB) or NumPy arrays
+Vector = Union[Sequence[float], np.ndarray]
+
+# Unit vectors are stored as int8 codes scaled by INT8_SCALE, so a code dot
+# product of INT8_SCALE ** 2 corresponds to a cosine similarity of 1
+INT8_SCALE = 127
+
+# Pairs whose int8 score is within this margin below the threshold are
+# reconfirmed in float; quantization error on the dot product is ~0.003
+INT8_SCREEN_MARGIN = 0.02
+
+
+def quantize_embedding(vector: Vector) -> np.ndarray:
+    """L2-normalize an embedding and quantize it to int8.
+    
+    Args:
+        vector: Embedding vector
+        
+    Returns:
+        int8 array with components in [-INT8_SCALE, INT8_SCALE]
+        
+    Raises:
+        ValueError: If the vector is empty or has zero magnitude
+    """
+    v = np.asarray(vector, dtype=np.float64)
+    if v.ndim != 1 or v.size == 0:
+        raise ValueError("Vectors cannot be empty")
+    
+    magnitude = np.linalg.norm(v)
+    if magnitude == 0:
+        raise ValueError("Vector magnitude cannot be zero")
+    
+    return np.rint(v / magnitude * INT8_SCALE).astype(np.int8)
+
 
 class SimilarityService:
     """Service for computing semantic similarity and applying cooldown logic."""
@@ -30,7 +65,7 @@ class SimilarityService:
         self._cooldown_days = cooldown_days
         logger.info(f"SimilarityService initialized (threshold: {similarity_threshold}, cooldown: {cooldown_days} days)")
     
-    def cosine_similarity(self, vec1: List[float], vec2: List[float]) -> float:
+    def cosine_similarity(self, vec1: Vector, vec2: Vector) -> float:
         """Compute cosine similarity between two vectors.
         
         Args:
@@ -43,31 +78,31 @@ class SimilarityService:
         Raises:
             ValueError: If vectors are invalid or have different dimensions
         """
-        if not vec1 or not vec2:
-            raise ValueError("Vectors cannot be empty")
+        v1 = np.asarray(vec1, dtype=np.float64)
+        v2 = np.asarray(vec2, dtype=np.float64)
         
-        if len(vec1) != len(vec2):
-            raise ValueError(f"Vector dimensions must match: {len(vec1)} != {len(vec2)}")
+        if v1.size == 0 or v2.size == 0:
+            raise ValueError("Vectors cannot be empty")
         
-        # Compute dot product
-        dot_product = sum(a * b for a, b in zip(vec1, vec2))
+        if v1.shape != v2.shape:
+            raise ValueError(f"Vector dimensions must match: {len(v1)} != {len(v2)}")
         
         # Compute magnitudes
-        magnitude1 = math.sqrt(sum(a * a for a in vec1))
-        magnitude2 = math.sqrt(sum(b * b for b in vec2))
+        magnitude1 = np.linalg.norm(v1)
+        magnitude2 = np.linalg.norm(v2)
         
         if magnitude1 == 0 or magnitude2 == 0:
             raise ValueError("Vector magnitude cannot be zero")
         
         # Compute cosine similarity
-        similarity = dot_product / (magnitude1 * magnitude2)
+        similarity = float(v1 @ v2) / float(magnitude1 * magnitude2)
         
         # Clamp to [0, 1] range (handle floating point errors)
         clamped_similarity = max(0.0, min(1.0, similarity))
         logger.debug(f"Computed cosine similarity: {clamped_similarity:.4f}")
         return clamped_similarity
     
-    def is_similar(self, vec1: List[float], vec2: List[float]) -> bool:
+    def is_similar(self, vec1: Vector, vec2: Vector) -> bool:
         """Check if two vectors are similar based on threshold.
         
         Args:
@@ -102,34 +137,110 @@ class SimilarityService:
         if "embedding" not in new_recommendation:
             raise ValueError("new_recommendation must have 'embedding' field")
         
-        new_embedding = new_recommendation["embedding"]
+        # Skip recommendations without embedding or timestamp
+        comparable = [
+            h for h in historical_recommendations
+            if "embedding" in h and "timestamp" in h
+        ]
         
-        for historical in historical_recommendations:
-            if "embedding" not in historical:
-                continue  # Skip recommendations without embeddings
-            
-            if "timestamp" not in historical:
-                continue  # Skip recommendations without timestamp
-            
-            historical_embedding = historical["embedding"]
-            
-            # Check similarity
-            if self.is_similar(new_embedding, historical_embedding):
-                # Check cooldown period
-                historical_time = datetime.fromisoformat(historical["timestamp"])
-                time_diff = datetime.utcnow() - historical_time
-                
-                if time_diff.days < self._cooldown_days:
-                    # Within cooldown - filter out
-                    logger.info(f"Recommendation filtered: similar to one from {time_diff.days} days ago (within {self._cooldown_days} day cooldown)")
-                    return (True, historical)
-                else:
-                    # Outside cooldown - allow but mark as "sin cambios"
-                    logger.info(f"Recommendation marked as 'repeated_no_change': similar to one from {time_diff.days} days ago (outside cooldown)")
-                    return (False, historical)
-        
-        # No similar recommendation found
-        return (False, None)
+        # Every norm is computed once instead of once per compared pair
+        match_index = self._first_matches(
+            [new_recommendation["embedding"]],
+            [h["embedding"] for h in comparable],
+            [h.get("embedding_int8") for h in comparable]
+        )[0]
+        
+        if match_index is None:
+            # No similar recommendation found
+            return (False, None)
+        
+        historical = comparable[match_index]
+        return (self._within_cooldown(historical), historical)
+    
+    def _within_cooldown(self, historical: Dict[str, Any], now: Optional[datetime] = None) -> bool:
+        """Return True if a matching historical recommendation is still in cooldown."""
+        historical_time = datetime.fromisoformat(historical["timestamp"])
+        time_diff = (now or datetime.utcnow()) - historical_time
+        
+        if time_diff.days < self._cooldown_days:
+            # Within cooldown - filter out
+            logger.info(f"Recommendation filtered: similar to one from {time_diff.days} days ago (within {self._cooldown_days} day cooldown)")
+            return True
+        
+        # Outside cooldown - allow but mark as "sin cambios"
+        logger.info(f"Recommendation marked as 'repeated_no_change': similar to one from {time_diff.days} days ago (outside cooldown)")
+        return False
+    
+    @staticmethod
+    def _normalized_rows(vectors: List[Vector]) -> np.ndarray:
+        """Stack vectors into a matrix of unit-length rows.
+        
+        Raises:
+            ValueError: If vectors are empty, have different dimensions or zero magnitude
+        """
+        arrays = [np.asarray(v, dtype=np.float64) for v in vectors]
+        if any(a.ndim != 1 or a.size == 0 for a in arrays):
+            raise ValueError("Vectors cannot be empty")
+        if len({a.size for a in arrays}) > 1:
+            raise ValueError(f"Vector dimensions must match: {sorted({a.size for a in arrays})}")
+        
+        matrix = np.stack(arrays)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        if not norms.all():
+            raise ValueError("Vector magnitude cannot be zero")
+        return matrix / norms
+    
+    def _screened_similarities(
+        self,
+        new_embeddings: List[Vector],
+        historical_embeddings: List[Vector],
+        historical_codes: List[bytes]
+    ) -> np.ndarray:
+        """Similarity matrix using int8 codes, exact only for candidate pairs.
+        
+        Pairs whose int8 score falls clearly below the threshold are left at 0;
+        the rest are recomputed from the float embeddings.
+        """
+        new_codes = np.stack([quantize_embedding(v) for v in new_embeddings])
+        codes = np.stack([np.frombuffer(c, dtype=np.int8) for c in historical_codes])
+        if codes.shape[1] != new_codes.shape[1]:
+            raise ValueError(f"Vector dimensions must match: {new_codes.shape[1]} != {codes.shape[1]}")
+        
+        scores = new_codes.astype(np.int32) @ codes.T.astype(np.int32)
+        cutoff = (self._similarity_threshold - INT8_SCREEN_MARGIN) * INT8_SCALE ** 2
+        
+        similarities = np.zeros(scores.shape)
+        for i, j in zip(*np.nonzero(scores >= cutoff)):
+            similarities[i, j] = self.cosine_similarity(new_embeddings[i], historical_embeddings[j])
+        return similarities
+    
+    def _first_matches(
+        self,
+        new_embeddings: List[Vector],
+        historical_embeddings: List[Vector],
+        historical_codes: Optional[List[Optional[bytes]]] = None
+    ) -> List[Optional[int]]:
+        """Index of the first similar historical embedding for each new one.
+        
+        All pairs are scored with a single matrix product instead of one
+        cosine_similarity call per pair. When every historical embedding has
+        int8 codes, those are used to screen pairs before the float check.
+        """
+        if not new_embeddings or not historical_embeddings:
+            return [None] * len(new_embeddings)
+        
+        if historical_codes and all(c is not None for c in historical_codes):
+            similarities = self._screened_similarities(new_embeddings, historical_embeddings, historical_codes)
+        else:
+            normalized = self._normalized_rows(list(new_embeddings) + list(historical_embeddings))
+            new_matrix = normalized[:len(new_embeddings)]
+            historical_matrix = normalized[len(new_embeddings):]
+            similarities = np.clip(new_matrix @ historical_matrix.T, 0.0, 1.0)
+        
+        hits = similarities >= self._similarity_threshold
+        first_hit = hits.argmax(axis=1)
+        
+        return [int(j) if hits[i, j] else None for i, j in enumerate(first_hit)]
     
     def filter_recommendations(
         self,
@@ -156,12 +267,39 @@ class SimilarityService:
         if not isinstance(historical_recommendations, list):
             raise ValueError("historical_recommendations must be a list")
         
+        for new_rec in new_recommendations:
+            if "embedding" not in new_rec:
+                raise ValueError("new_recommendation must have 'embedding' field")
+        
+        # Nothing to compare against (e.g. a new executive): everything is new
+        if not historical_recommendations:
+            for new_rec in new_recommendations:
+                new_rec["status"] = "new"
+            return list(new_recommendations)
+        
+        # Historical recommendations without embedding or timestamp are ignored
+        comparable = [
+            h for h in historical_recommendations
+            if "embedding" in h and "timestamp" in h
+        ]
+        matches = self._first_matches(
+            [r["embedding"] for r in new_recommendations],
+            [h["embedding"] for h in comparable],
+            [h.get("embedding_int8") for h in comparable]
+        )
+        
         filtered = []
         
-        for new_rec in new_recommendations:
-            should_filter, matching_rec = self.check_recommendation_similarity(
-                new_rec, historical_recommendations
-            )
+        # Each matched historical is checked once, against a single "now"
+        now = datetime.utcnow()
+        in_cooldown = {
+            index: self._within_cooldown(comparable[index], now)
+            for index in set(matches) if index is not None
+        }
+        
+        for new_rec, match_index in zip(new_recommendations, matches):
+            matching_rec = comparable[match_index] if match_index is not None else None
+            should_filter = matching_rec is not None and in_cooldown[match_index]
             
             if should_filter:
                 # Skip this recommendation (within cooldown)
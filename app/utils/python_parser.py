@@ -4,15 +4,37 @@ AST-based Python file parser for code documentation analysis.
 This module provides functionality to parse Python source files using the
 Abstract Syntax Tree (AST) and extract information about classes, methods,
 and functions, including their docstrings.
+
+It only uses the standard library, so batch runs over a whole repository
+can use PyPy:
+
+    pypy3 -m app.utils.python_parser app --workers 4
 """
 
+import argparse
 import ast
-from dataclasses import dataclass
-from typing import List, Optional, Dict, Any
+import fnmatch
+import os
+import pickle
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import List, Optional, Dict, Any, Tuple, Iterator
 from pathlib import Path
 
+# Below this many uncached files a process pool costs more than it saves
+PARALLEL_MIN_FILES = 4
+
+# Directories that hold caches, environments, vendored or build output
+IGNORED_DIRECTORIES = frozenset({
+    '__pycache__', '.git', '.venv', 'venv', 'site-packages', 'node_modules', 'build', 'dist'
+})
+
+# Generated modules with large ASTs and nothing worth documenting
+GENERATED_FILE_PATTERNS = ('*_pb2.py', '*_pb2_grpc.py')
 
-@dataclass
+
+@dataclass(slots=True)
 class FunctionInfo:
     """
     Information about a function or method extracted from Python code.
@@ -31,16 +53,11 @@ class FunctionInfo:
     docstring: Optional[str]
     is_method: bool
     class_name: Optional[str] = None
-    parameters: List[str] = None
+    parameters: List[str] = field(default_factory=list)
     is_async: bool = False
-    
-    def __post_init__(self):
-        """Initialize default values for mutable fields."""
-        if self.parameters is None:
-            self.parameters = []
 
 
-@dataclass
+@dataclass(slots=True)
 class ClassInfo:
     """
     Information about a class extracted from Python code.
@@ -55,18 +72,11 @@ class ClassInfo:
     name: str
     line_number: int
     docstring: Optional[str]
-    methods: List[FunctionInfo] = None
-    base_classes: List[str] = None
-    
-    def __post_init__(self):
-        """Initialize default values for mutable fields."""
-        if self.methods is None:
-            self.methods = []
-        if self.base_classes is None:
-            self.base_classes = []
+    methods: List[FunctionInfo] = field(default_factory=list)
+    base_classes: List[str] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class ParseResult:
     """
     Result of parsing a Python file.
@@ -78,16 +88,9 @@ class ParseResult:
         parse_error: Error message if parsing failed, None otherwise
     """
     file_path: str
-    classes: List[ClassInfo] = None
-    functions: List[FunctionInfo] = None
+    classes: List[ClassInfo] = field(default_factory=list)
+    functions: List[FunctionInfo] = field(default_factory=list)
     parse_error: Optional[str] = None
-    
-    def __post_init__(self):
-        """Initialize default values for mutable fields."""
-        if self.classes is None:
-            self.classes = []
-        if self.functions is None:
-            self.functions = []
 
 
 class PythonFileParser:
@@ -96,14 +99,52 @@ class PythonFileParser:
     
     This class provides methods to parse Python files and extract information
     about classes, methods, and functions, including their docstrings.
+    
+    With a cache_path, results are cached per file and reused while the file's
+    modification time and size are unchanged; the cache is loaded on creation
+    and written back by close(), so repeated runs skip unchanged files. Without
+    one, nothing is cached and results are not kept after they are returned.
     """
     
-    def parse_file(self, file_path: str) -> ParseResult:
+    def __init__(self, cache_path: Optional[str] = None):
+        """
+        Initialize the parser.
+        
+        Args:
+            cache_path: Optional file used to cache and persist parse results
+                between runs; None disables caching
+        """
+        self._cache_path = Path(cache_path) if cache_path else None
+        self._cache: Dict[str, Tuple[int, int, ParseResult]] = {}
+        
+        if self._cache_path is not None and self._cache_path.exists():
+            try:
+                with open(self._cache_path, 'rb') as f:
+                    self._cache = pickle.load(f)
+                for entry in self._cache.values():
+                    _intern_names(entry[2])
+            except (OSError, EOFError, pickle.UnpicklingError, AttributeError, TypeError):
+                # Unreadable or outdated cache: start empty
+                self._cache = {}
+    
+    def close(self) -> None:
+        """
+        Write the parse cache to cache_path, if one was given.
+        """
+        if self._cache_path is None:
+            return
+        
+        with open(self._cache_path, 'wb') as f:
+            pickle.dump(self._cache, f, protocol=pickle.HIGHEST_PROTOCOL)
+    
+    def parse_file(self, file_path: str, include_docstrings: bool = True) -> ParseResult:
         """
         Parse a Python file and extract class and function information.
         
         Args:
             file_path: Path to the Python file to parse
+            include_docstrings: If False, docstrings are not extracted (left as None),
+                unless a cached full result is available
             
         Returns:
             ParseResult containing extracted information or error details
@@ -116,8 +157,65 @@ class PythonFileParser:
         if not path.exists():
             raise FileNotFoundError(f"File not found: {file_path}")
         
+        stat = path.stat()
+        key = str(path)
+        if stat.st_size == 0:
+            return ParseResult(file_path=key)
+        
+        cached = self._cached_result(key, stat)
+        if cached is not None:
+            return cached
+        
+        result = self._parse_path(path, include_docstrings)
+        # Only complete results are cached, so a later full parse never gets a partial one
+        if include_docstrings:
+            self._remember(key, stat.st_mtime_ns, stat.st_size, result)
+        return result
+    
+    def _remember(self, key: str, mtime_ns: int, size: int, result: ParseResult) -> None:
+        """
+        Cache a parse result if the parser has a cache_path.
+        
+        Args:
+            key: Cache key (the file path as a string)
+            mtime_ns: File modification time when parsed
+            size: File size when parsed
+            result: Parse result to cache
+        """
+        if self._cache_path is not None:
+            self._cache[key] = (mtime_ns, size, result)
+    
+    def _cached_result(self, key: str, stat: os.stat_result) -> Optional[ParseResult]:
+        """
+        Return the cached result for a file if it has not changed since parsing.
+        
+        Args:
+            key: Cache key (the file path as a string)
+            stat: Current stat of the file
+            
+        Returns:
+            Cached ParseResult, or None if missing or stale
+        """
+        cached = self._cache.get(key)
+        if cached is not None and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+            return cached[2]
+        return None
+    
+    def _parse_path(self, path: Path, include_docstrings: bool = True) -> ParseResult:
+        """
+        Read and parse a Python file without using the cache.
+        
+        Args:
+            path: Path to an existing Python file
+            include_docstrings: If False, skip docstring extraction
+            
+        Returns:
+            ParseResult containing extracted information or error details
+        """
         try:
-            with open(path, 'r', encoding='utf-8') as f:
+            # Bytes are decoded by the compiler itself, which also honours
+            # PEP 263 coding declarations
+            with open(path, 'rb') as f:
                 source_code = f.read()
             
             tree = ast.parse(source_code, filename=str(path))
@@ -125,15 +223,15 @@ class PythonFileParser:
             classes = []
             functions = []
             
-            for node in ast.walk(tree):
+            # Only module-level statements are visited; methods are extracted
+            # from each class body by _extract_class_info
+            for node in tree.body:
                 if isinstance(node, ast.ClassDef):
-                    class_info = self._extract_class_info(node)
+                    class_info = self._extract_class_info(node, include_docstrings)
                     classes.append(class_info)
                 elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
-                    # Only extract top-level functions (not methods)
-                    if self._is_top_level_function(node, tree):
-                        function_info = self._extract_function_info(node)
-                        functions.append(function_info)
+                    function_info = self._extract_function_info(node, include_docstrings=include_docstrings)
+                    functions.append(function_info)
             
             return ParseResult(
                 file_path=str(path),
@@ -152,35 +250,40 @@ class PythonFileParser:
                 parse_error=f"Parse error: {str(e)}"
             )
     
-    def _extract_class_info(self, node: ast.ClassDef) -> ClassInfo:
+    def _extract_class_info(self, node: ast.ClassDef, include_docstrings: bool = True) -> ClassInfo:
         """
         Extract information from a class definition node.
         
         Args:
             node: AST ClassDef node
+            include_docstrings: If False, docstrings are left as None
             
         Returns:
             ClassInfo object with extracted information
         """
-        docstring = ast.get_docstring(node)
+        docstring = ast.get_docstring(node) if include_docstrings else None
+        
+        # Identifiers are interned so repeated names share one string object
+        name = sys.intern(node.name)
         
         # Extract base classes
-        base_classes = []
-        for base in node.bases:
-            if isinstance(base, ast.Name):
-                base_classes.append(base.id)
-            elif isinstance(base, ast.Attribute):
-                base_classes.append(self._get_attribute_name(base))
+        base_classes = [
+            sys.intern(base.id) if isinstance(base, ast.Name) else self._get_attribute_name(base)
+            for base in node.bases
+            if isinstance(base, (ast.Name, ast.Attribute))
+        ]
         
         # Extract methods
-        methods = []
-        for item in node.body:
-            if isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef)):
-                method_info = self._extract_function_info(item, is_method=True, class_name=node.name)
-                methods.append(method_info)
+        methods = [
+            self._extract_function_info(
+                item, is_method=True, class_name=name, include_docstrings=include_docstrings
+            )
+            for item in node.body
+            if isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef))
+        ]
         
         return ClassInfo(
-            name=node.name,
+            name=name,
             line_number=node.lineno,
             docstring=docstring,
             methods=methods,
@@ -191,7 +294,8 @@ class PythonFileParser:
         self,
         node: ast.FunctionDef | ast.AsyncFunctionDef,
         is_method: bool = False,
-        class_name: Optional[str] = None
+        class_name: Optional[str] = None,
+        include_docstrings: bool = True
     ) -> FunctionInfo:
         """
         Extract information from a function or method definition node.
@@ -200,19 +304,18 @@ class PythonFileParser:
             node: AST FunctionDef or AsyncFunctionDef node
             is_method: True if this is a class method
             class_name: Name of the containing class (for methods)
+            include_docstrings: If False, the docstring is left as None
             
         Returns:
             FunctionInfo object with extracted information
         """
-        docstring = ast.get_docstring(node)
+        docstring = ast.get_docstring(node) if include_docstrings else None
         
         # Extract parameter names
-        parameters = []
-        if node.args.args:
-            parameters = [arg.arg for arg in node.args.args]
+        parameters = [sys.intern(arg.arg) for arg in node.args.args]
         
         return FunctionInfo(
-            name=node.name,
+            name=sys.intern(node.name),
             line_number=node.lineno,
             docstring=docstring,
             is_method=is_method,
@@ -221,26 +324,6 @@ class PythonFileParser:
             is_async=isinstance(node, ast.AsyncFunctionDef)
         )
     
-    def _is_top_level_function(self, node: ast.FunctionDef | ast.AsyncFunctionDef, tree: ast.Module) -> bool:
-        """
-        Check if a function is defined at the top level (not inside a class).
-        
-        Args:
-            node: Function node to check
-            tree: The module AST tree
-            
-        Returns:
-            True if the function is at the top level, False otherwise
-        """
-        for item in tree.body:
-            if item is node:
-                return True
-            if isinstance(item, ast.ClassDef):
-                for class_item in item.body:
-                    if class_item is node:
-                        return False
-        return False
-    
     def _get_attribute_name(self, node: ast.Attribute) -> str:
         """
         Get the full name of an attribute node.
@@ -251,25 +334,68 @@ class PythonFileParser:
         Returns:
             String representation of the attribute
         """
-        if isinstance(node.value, ast.Name):
-            return f"{node.value.id}.{node.attr}"
-        elif isinstance(node.value, ast.Attribute):
-            return f"{self._get_attribute_name(node.value)}.{node.attr}"
-        return node.attr
+        # Walk the chain iteratively and join once instead of recursing
+        parts = [node.attr]
+        current = node.value
+        while isinstance(current, ast.Attribute):
+            parts.append(current.attr)
+            current = current.value
+        if isinstance(current, ast.Name):
+            parts.append(current.id)
+        return sys.intern('.'.join(reversed(parts)))
     
-    def parse_directory(self, directory_path: str, recursive: bool = True) -> List[ParseResult]:
+    def parse_directory(
+        self,
+        directory_path: str,
+        recursive: bool = True,
+        max_workers: Optional[int] = 1,
+        ignore_patterns: Optional[List[str]] = None
+    ) -> List[ParseResult]:
         """
         Parse all Python files in a directory.
         
+        Collects iter_parse_directory into a list; see it for the arguments.
+        
+        Returns:
+            List of ParseResult objects for each Python file found
+            
+        Raises:
+            FileNotFoundError: If the directory does not exist
+            ValueError: If the path is not a directory or max_workers is not positive
+        """
+        return list(self.iter_parse_directory(directory_path, recursive, max_workers, ignore_patterns))
+    
+    def iter_parse_directory(
+        self,
+        directory_path: str,
+        recursive: bool = True,
+        max_workers: Optional[int] = 1,
+        ignore_patterns: Optional[List[str]] = None
+    ) -> Iterator[ParseResult]:
+        """
+        Parse all Python files in a directory, yielding each result as it is ready.
+        
+        Without a cache_path, only the results not yet consumed are held (one at a
+        time when parsing serially), so callers that process results one by one
+        do not keep the whole repository in memory; with one, every result is
+        also kept in the cache until close() writes it. Arguments are
+        validated immediately; files are parsed as the iterator is consumed.
+        Subdirectories named in IGNORED_DIRECTORIES are not entered.
+        
         Args:
             directory_path: Path to the directory to parse
             recursive: If True, parse subdirectories recursively
+            max_workers: Processes used to parse uncached files; 1 parses in this
+                process, None uses one per CPU
+            ignore_patterns: Glob patterns of file names to skip (defaults to
+                GENERATED_FILE_PATTERNS; pass [] to parse every file)
             
         Returns:
-            List of ParseResult objects for each Python file found
+            Iterator of ParseResult objects, one per Python file found
             
         Raises:
             FileNotFoundError: If the directory does not exist
+            ValueError: If the path is not a directory or max_workers is not positive
         """
         path = Path(directory_path)
         
@@ -279,12 +405,157 @@ class PythonFileParser:
         if not path.is_dir():
             raise ValueError(f"Not a directory: {directory_path}")
         
-        results = []
+        if max_workers is not None and max_workers <= 0:
+            raise ValueError("max_workers must be positive")
+        
+        if ignore_patterns is None:
+            ignore_patterns = GENERATED_FILE_PATTERNS
+        
+        py_files = []
+        
+        # os.scandir reuses the file type from the directory listing, so no
+        # extra stat() per entry; symlinked directories are not followed
+        stack = [str(path)]
+        while stack:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        if recursive and entry.name not in IGNORED_DIRECTORIES:
+                            stack.append(entry.path)
+                    elif (
+                        entry.name.endswith(".py")
+                        and entry.is_file()
+                        and not any(fnmatch.fnmatch(entry.name, pattern) for pattern in ignore_patterns)
+                    ):
+                        py_files.append(entry.path)
+        
+        if max_workers == 1:
+            return (self.parse_file(file_path) for file_path in py_files)
+        
+        return self._iter_files_parallel(py_files, max_workers)
+    
+    def _iter_files_parallel(self, py_files: List[str], max_workers: Optional[int]) -> Iterator[ParseResult]:
+        """
+        Parse files in a process pool, reusing cached results.
+        
+        Args:
+            py_files: Paths of the files to parse
+            max_workers: Number of worker processes (None for one per CPU)
+            
+        Yields:
+            ParseResult objects in the same order as py_files
+        """
+        results: List[Optional[ParseResult]] = []
+        misses = []
+        for file_path in py_files:
+            stat = os.stat(file_path)
+            if stat.st_size == 0:
+                results.append(ParseResult(file_path=file_path))
+                continue
+            cached = self._cached_result(file_path, stat)
+            if cached is None:
+                misses.append(len(results))
+            results.append(cached)
         
-        pattern = "**/*.py" if recursive else "*.py"
-        for py_file in path.glob(pattern):
-            if py_file.is_file():
-                result = self.parse_file(str(py_file))
-                results.append(result)
+        if len(misses) < PARALLEL_MIN_FILES:
+            for file_path, result in zip(py_files, results):
+                yield result if result is not None else self.parse_file(file_path)
+            return
         
-        return results
+        workers = max_workers or os.cpu_count() or 1
+        chunksize = max(1, len(misses) // (workers * 4))
+        executor = ProcessPoolExecutor(max_workers=max_workers)
+        try:
+            parsed = executor.map(_parse_one, [py_files[i] for i in misses], chunksize=chunksize)
+            for file_path, result in zip(py_files, results):
+                if result is None:
+                    mtime_ns, size, result = next(parsed)
+                    _intern_names(result)
+                    self._remember(file_path, mtime_ns, size, result)
+                yield result
+        finally:
+            # Drop queued work if the caller stops iterating early
+            executor.shutdown(cancel_futures=True)
+
+
+def _intern_names(result: ParseResult) -> None:
+    """
+    Re-intern the identifiers of an unpickled result.
+    
+    Strings coming back from a worker process or the cache file are fresh
+    copies, so they are interned again to share storage with the rest.
+    
+    Args:
+        result: ParseResult to update in place
+    """
+    for cls in result.classes:
+        cls.name = sys.intern(cls.name)
+        cls.base_classes = [sys.intern(base) for base in cls.base_classes]
+        for method in cls.methods:
+            method.name = sys.intern(method.name)
+            method.class_name = cls.name
+            method.parameters = [sys.intern(param) for param in method.parameters]
+    for function in result.functions:
+        function.name = sys.intern(function.name)
+        function.parameters = [sys.intern(param) for param in function.parameters]
+
+
+def _parse_one(file_path: str) -> Tuple[int, int, ParseResult]:
+    """
+    Parse one file in a worker process.
+    
+    Args:
+        file_path: Path to the Python file
+        
+    Returns:
+        Tuple of (st_mtime_ns, st_size, ParseResult) for the parent's cache
+    """
+    path = Path(file_path)
+    stat = path.stat()
+    return stat.st_mtime_ns, stat.st_size, PythonFileParser()._parse_path(path)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Command-line entry point: parse a directory and print a summary per file.
+    
+    Args:
+        argv: Command-line arguments (defaults to sys.argv)
+        
+    Returns:
+        Exit code: 0 if every file parsed, 1 otherwise
+    """
+    arg_parser = argparse.ArgumentParser(description="Summarize classes and functions in Python files.")
+    arg_parser.add_argument("directory", help="Directory to parse")
+    arg_parser.add_argument("--no-recursive", action="store_true", help="Do not parse subdirectories")
+    arg_parser.add_argument("--workers", type=int, default=1, help="Worker processes (0 for one per CPU)")
+    arg_parser.add_argument("--cache", help="File used to persist parse results between runs")
+    arg_parser.add_argument(
+        "--ignore", action="append", metavar="PATTERN",
+        help="Glob of file names to skip (repeatable; replaces the generated-file defaults)"
+    )
+    args = arg_parser.parse_args(argv)
+    
+    parser = PythonFileParser(cache_path=args.cache)
+    failed = 0
+    try:
+        results = parser.iter_parse_directory(
+            args.directory,
+            recursive=not args.no_recursive,
+            max_workers=args.workers or None,
+            ignore_patterns=args.ignore
+        )
+        for result in results:
+            if result.parse_error:
+                failed += 1
+                print(f"{result.file_path}: {result.parse_error}")
+            else:
+                print(f"{result.file_path}: {len(result.classes)} classes, {len(result.functions)} functions")
+    finally:
+        parser.close()
+    
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
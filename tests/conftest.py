@@ -2,14 +2,22 @@
 
 import pytest
 import os
+import requests
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from app.clients.mongodb_client import MongoDBClient
 
-# Load environment variables
-load_dotenv()
+
+@pytest.fixture(scope="session")
+def load_env():
+    """Load .env once per test run for fixtures that read credentials."""
+    # Loaded here rather than at import so collection and tests that never
+    # need credentials skip reading .env; session scope makes it once per process
+    load_dotenv()
 
 
 @pytest.fixture(scope="session")
-def test_config():
+def test_config(load_env):
     """Provide test configuration."""
     return {
         "mongodb_uri": os.getenv("MONGODB_URI"),
@@ -22,10 +30,37 @@ def test_config():
         "embedding_api_key": os.getenv("EMBEDDING_API_KEY"),
         "embedding_endpoint": os.getenv("EMBEDDING_ENDPOINT"),
         "embedding_model_name": os.getenv("EMBEDDING_MODEL_NAME", "text-embedding-3-large"),
+        # EMBEDDING_CACHE=1 reuses embeddings of repeated texts across runs
+        "embedding_cache_dir": (
+            os.path.join(".pytest_cache", "embeddings") if os.getenv("EMBEDDING_CACHE") == "1" else None
+        ),
         "api_base_url": os.getenv("API_BASE_URL", "http://localhost:8000")
     }
 
 
+@pytest.fixture(scope="session")
+def http_session():
+    """Provide a shared HTTP session so API tests reuse keep-alive connections."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=10, pool_maxsize=10)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    yield session
+    session.close()
+
+
+@pytest.fixture(scope="session")
+def mongodb_client(test_config):
+    """Provide a MongoDB client connected once per test run."""
+    client = MongoDBClient(
+        test_config["mongodb_uri"],
+        test_config["mongodb_database"]
+    )
+    client.connect()
+    yield client
+    client.disconnect()
+
+
 @pytest.fixture(scope="session")
 def testing_collections():
     """Provide names of testing collections."""
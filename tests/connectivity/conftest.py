@@ -0,0 +1,40 @@
+"""Connected client fixtures shared by the connectivity tests."""
+
+import pytest
+from app.clients.aws_bedrock_client import AWSBedrockClient
+from app.clients.email_client import SendGridEmailClient
+from app.clients.embedding_client import EmbeddingClient
+
+
+@pytest.fixture(scope="session")
+def bedrock_client(test_config):
+    """Provide an AWS Bedrock client connected once per test run."""
+    client = AWSBedrockClient(
+        test_config["aws_region"],
+        test_config["aws_bedrock_model_id"]
+    )
+    client.connect()
+    return client
+
+
+@pytest.fixture(scope="session")
+def embedding_client(test_config):
+    """Provide an embedding client connected once per test run."""
+    client = EmbeddingClient(
+        test_config["embedding_api_key"],
+        test_config["embedding_endpoint"],
+        test_config["embedding_model_name"]
+    )
+    client.connect()
+    return client
+
+
+@pytest.fixture(scope="session")
+def sendgrid_client(test_config):
+    """Provide a SendGrid client in testing mode."""
+    return SendGridEmailClient(
+        api_key=test_config["sendgrid_api_key"],
+        from_email=test_config["sendgrid_from_email"],
+        is_testing=True,
+        test_email_override=test_config["sendgrid_test_email"]
+    )
@@ -1,48 +1,47 @@
 """Tests for API health endpoints."""
 
 import pytest
-import requests
 
 
-def test_api_health_endpoint(test_config):
+def test_api_health_endpoint(test_config, http_session):
     """Test main health endpoint."""
-    response = requests.get(f"{test_config['api_base_url']}/api/health")
+    response = http_session.get(f"{test_config['api_base_url']}/api/health")
     
     assert response.status_code == 200
     data = response.json()
     assert data["status"] == "healthy"
 
 
-def test_mongodb_health_endpoint(test_config):
+def test_mongodb_health_endpoint(test_config, http_session):
     """Test MongoDB health endpoint."""
-    response = requests.get(f"{test_config['api_base_url']}/api/health/mongodb")
+    response = http_session.get(f"{test_config['api_base_url']}/api/health/mongodb")
     
     assert response.status_code == 200
     data = response.json()
     assert data["status"] == "connected"
 
 
-def test_bedrock_health_endpoint(test_config):
+def test_bedrock_health_endpoint(test_config, http_session):
     """Test AWS Bedrock health endpoint."""
-    response = requests.get(f"{test_config['api_base_url']}/api/health/bedrock")
+    response = http_session.get(f"{test_config['api_base_url']}/api/health/bedrock")
     
     assert response.status_code == 200
     data = response.json()
     assert data["status"] == "connected"
 
 
-def test_sendgrid_health_endpoint(test_config):
+def test_sendgrid_health_endpoint(test_config, http_session):
     """Test SendGrid health endpoint."""
-    response = requests.get(f"{test_config['api_base_url']}/api/health/sendgrid")
+    response = http_session.get(f"{test_config['api_base_url']}/api/health/sendgrid")
     
     assert response.status_code == 200
     data = response.json()
     assert data["status"] == "configured"
 
 
-def test_embedding_health_endpoint(test_config):
+def test_embedding_health_endpoint(test_config, http_session):
     """Test Embedding service health endpoint."""
-    response = requests.get(f"{test_config['api_base_url']}/api/health/embedding")
+    response = http_session.get(f"{test_config['api_base_url']}/api/health/embedding")
     
     assert response.status_code == 200
     data = response.json()
@@ -1,35 +1,20 @@
 """Tests for AWS Bedrock connectivity."""
 
 import pytest
-from app.clients.aws_bedrock_client import AWSBedrockClient
 
 
-def test_bedrock_connection(test_config):
+def test_bedrock_connection(bedrock_client):
     """Test AWS Bedrock connection can be established."""
-    client = AWSBedrockClient(
-        test_config["aws_region"],
-        test_config["aws_bedrock_model_id"]
-    )
-    
-    # Should connect without errors
-    client.connect()
-    
-    # Test simple analysis
+    # The fixture has already connected; test simple analysis
     test_data = [{"test": "connection"}]
-    result = client.analyze(test_data, prompt="Respond with: OK")
+    result = bedrock_client.analyze(test_data, prompt="Respond with: OK")
     
     assert "analysis" in result
     assert isinstance(result["analysis"], str)
 
 
-def test_bedrock_analysis_response(test_config):
+def test_bedrock_analysis_response(test_config, bedrock_client):
     """Test AWS Bedrock returns valid analysis responses."""
-    client = AWSBedrockClient(
-        test_config["aws_region"],
-        test_config["aws_bedrock_model_id"]
-    )
-    client.connect()
-    
     test_data = [
         {
             "id_ejecutivo": 1,
@@ -39,7 +24,7 @@ def test_bedrock_analysis_response(test_config):
         }
     ]
     
-    result = client.analyze(
+    result = bedrock_client.analyze(
         test_data,
         prompt="Analyze this sales data and return a brief summary."
     )
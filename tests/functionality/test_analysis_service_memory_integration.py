@@ -31,6 +31,10 @@ class MockDataClient(IDataClient):
     def insert_one(self, collection: str, document: Dict[str, Any]) -> str:
         self.inserted_docs.append(document)
         return "mock_id_123"
+    
+    def insert_many(self, collection: str, documents: List[Dict[str, Any]]) -> List[str]:
+        self.inserted_docs.extend(documents)
+        return ["mock_id_123"] * len(documents)
 
 
 class MockAIClient(IAIClient):
@@ -27,11 +27,15 @@ def app():
 
 
 @pytest.fixture
-def mock_settings():
+def mock_settings(load_env):
     """Create mock settings."""
     import os
     settings = Mock(spec=Settings)
     settings.sendgrid_api_key = "test-api-key"
+    settings.sendgrid_endpoint = "https://api.sendgrid.com/v3/mail/send"
+    settings.email_pool_size = 5
+    settings.email_max_messages_per_connection = 100
+    settings.email_send_in_background = False
     settings.sendgrid_from_email = os.getenv("SENDGRID_FROM_EMAIL", "noreply@test.local")
     settings.sendgrid_test_email = os.getenv("SENDGRID_TEST_EMAIL", "test@test.local")
     settings.mongodb_database = "test_db"
@@ -454,3 +458,54 @@ class TestHealthCheckEndpoints:
         assert data["status"] == "configured"
         assert "from_email" in data
         assert "test_email" in data
+
+
+class TestBackgroundNotifications:
+    """Tests for sending notifications after the response."""
+
+    def test_background_send_calls_service(self):
+        """The background task forwards its arguments to the service."""
+        from app.api.routes import _send_notifications_in_background
+
+        notification_service = Mock()
+        notification_service.send_analysis_notifications.return_value = {"total_sent": 1, "total_failed": 0}
+
+        _send_notifications_in_background(notification_service, {"data": {}}, "2026-02-25", True)
+
+        notification_service.send_analysis_notifications.assert_called_once_with(
+            analysis_result={"data": {}}, current_date="2026-02-25", is_testing=True
+        )
+
+    def test_background_send_errors_are_logged(self):
+        """Errors in the background task do not propagate."""
+        from app.api.routes import _send_notifications_in_background
+
+        notification_service = Mock()
+        notification_service.send_analysis_notifications.side_effect = RuntimeError("down")
+
+        _send_notifications_in_background(notification_service, {"data": {}}, "2026-02-25", False)
+
+
+class TestNotificationServiceFactory:
+    """Tests for get_notification_service."""
+
+    def test_email_client_is_reused_per_mode(self, mock_settings):
+        """Requests in the same mode share one email client."""
+        from app.api.routes import get_notification_service
+
+        set_settings(mock_settings)
+
+        first = get_notification_service(is_testing=False)
+        second = get_notification_service(is_testing=False)
+
+        assert first._email_client is second._email_client
+
+    def test_new_settings_drop_cached_clients(self, mock_settings):
+        """Configuring settings again builds a fresh email client."""
+        from app.api.routes import get_notification_service
+
+        set_settings(mock_settings)
+        first = get_notification_service(is_testing=False)
+        set_settings(mock_settings)
+
+        assert get_notification_service(is_testing=False)._email_client is not first._email_client
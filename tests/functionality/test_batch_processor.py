@@ -0,0 +1,298 @@
+"""
+Unit tests for BatchProcessor.
+
+These tests exercise batch division, parallel execution and result
+consolidation using plain Python callables (no external services).
+"""
+
+import asyncio
+import threading
+import time
+import pytest
+from app.services.batch_processor import BatchProcessor, BatchConfig, BatchResult
+
+
+def _echo_batch(batch_data, batch_num):
+    """Return the batch unchanged."""
+    return list(batch_data)
+
+
+def _slow_first_batch(batch_data, batch_num):
+    """Make batch 1 finish last."""
+    if batch_num == 1:
+        time.sleep(0.05)
+    return list(batch_data)
+
+
+def _failing_batch(batch_data, batch_num):
+    """Fail on batch 2 only."""
+    if batch_num == 2:
+        raise RuntimeError("boom")
+    return list(batch_data)
+
+
+class TestAiterResults:
+    """Tests for streaming batch results."""
+
+    def test_yields_in_completion_order(self):
+        """Fast batches are yielded before slow ones."""
+        processor = BatchProcessor(BatchConfig(batch_size=2, max_parallel_batches=4))
+        batches = processor.divide_into_batches(list(range(6)))
+
+        async def collect():
+            return [r async for r in processor.aiter_results(batches, _slow_first_batch)]
+
+        results = asyncio.run(collect())
+
+        assert len(results) == 3
+        assert all(isinstance(r, BatchResult) for r in results)
+        assert results[-1].batch_num == 1
+
+    def test_process_batches_async_keeps_batch_order(self):
+        """Collected results are returned in batch order."""
+        processor = BatchProcessor(BatchConfig(batch_size=2, max_parallel_batches=4))
+        batches = processor.divide_into_batches(list(range(6)))
+
+        results = asyncio.run(processor.process_batches_async(batches, _slow_first_batch))
+
+        assert [r.batch_num for r in results] == [1, 2, 3]
+        consolidated = processor.consolidate_results(results)
+        assert consolidated["data"] == list(range(6))
+
+    def test_failed_batch_does_not_stop_others(self):
+        """A failing batch is reported without affecting the rest."""
+        processor = BatchProcessor(BatchConfig(batch_size=2, max_parallel_batches=4))
+        batches = processor.divide_into_batches(list(range(6)))
+
+        results = asyncio.run(processor.process_batches_async(batches, _failing_batch))
+        consolidated = processor.consolidate_results(results)
+
+        assert consolidated["metadata"]["failed_batch_numbers"] == [2]
+        assert consolidated["data"] == [0, 1, 4, 5]
+
+
+class TestAdaptiveBatchSize:
+    """Tests for adaptive batch sizing."""
+
+    def test_static_size_when_not_adaptive(self):
+        """Batch size never changes with adaptive disabled."""
+        processor = BatchProcessor(BatchConfig(batch_size=5))
+
+        processor.consolidate_results([BatchResult(batch_num=1, success=True, duration=0.1)])
+
+        assert processor.batch_size == 5
+
+    def test_grows_when_batches_are_fast(self):
+        """Fast batches double the batch size up to the maximum."""
+        config = BatchConfig(batch_size=4, adaptive=True, max_batch_size=10, target_duration_low=1.0)
+        processor = BatchProcessor(config)
+
+        processor.consolidate_results([BatchResult(batch_num=1, success=True, duration=0.1)])
+        assert processor.batch_size == 8
+
+        processor.consolidate_results([BatchResult(batch_num=1, success=True, duration=0.1)])
+        assert processor.batch_size == 10
+
+    def test_shrinks_on_failures(self):
+        """A high failure rate halves the batch size."""
+        config = BatchConfig(batch_size=8, adaptive=True, max_failure_rate=0.2)
+        processor = BatchProcessor(config)
+
+        processor.consolidate_results([
+            BatchResult(batch_num=1, success=False, duration=30.0),
+            BatchResult(batch_num=2, success=True, duration=30.0),
+        ])
+
+        assert processor.batch_size == 4
+
+    def test_invalid_adaptive_bounds(self):
+        """Adaptive bounds must contain the initial batch size."""
+        with pytest.raises(ValueError):
+            BatchConfig(batch_size=30, adaptive=True, max_batch_size=20)
+
+
+class TestLazyBatchSources:
+    """Tests for batch sources without a known length."""
+
+    @pytest.mark.parametrize("enable_parallel", [True, False])
+    def test_generator_of_batches(self, enable_parallel):
+        """Generators are accepted in both parallel and sequential modes."""
+        processor = BatchProcessor(BatchConfig(batch_size=2, enable_parallel=enable_parallel))
+        batches = (list(range(i, i + 2)) for i in range(0, 6, 2))
+
+        results = asyncio.run(processor.process_batches_async(batches, _echo_batch))
+
+        assert [r.batch_num for r in results] == [1, 2, 3]
+        assert processor.consolidate_results(results)["data"] == list(range(6))
+
+
+    def test_source_pulled_as_slots_free(self):
+        """Only about max_parallel_batches batches are taken ahead of the results."""
+        processor = BatchProcessor(BatchConfig(batch_size=1, max_parallel_batches=2))
+        pulled = []
+
+        def source():
+            for i in range(10):
+                pulled.append(i)
+                yield [i]
+
+        async def first_result():
+            results = processor.aiter_results(source(), _echo_batch)
+            first = await results.__anext__()
+            await results.aclose()
+            return first
+
+        first = asyncio.run(first_result())
+
+        assert first.success
+        assert len(pulled) <= 3
+
+
+class TestDivideIntoBatches:
+    """Tests for dividing data into batches."""
+
+    def test_divide_76_items(self):
+        """76 items with batch size 5 yield 16 batches."""
+        processor = BatchProcessor(BatchConfig(batch_size=5))
+
+        batches = processor.divide_into_batches([{"id": i} for i in range(76)])
+
+        assert len(batches) == 16
+        assert len(batches[-1]) == 1
+        assert sum(len(b) for b in batches) == 76
+
+    def test_divide_non_list_input(self):
+        """Tuples and generators are split the same way as lists."""
+        processor = BatchProcessor(BatchConfig(batch_size=3))
+
+        assert processor.divide_into_batches(range(7)) == [[0, 1, 2], [3, 4, 5], [6]]
+        assert processor.divide_into_batches(x for x in "abcd") == [["a", "b", "c"], ["d"]]
+
+    def test_divide_empty(self):
+        """No data produces no batches."""
+        assert BatchProcessor().divide_into_batches([]) == []
+
+
+class TestCoalescing:
+    """Tests for running several batches per executor call."""
+
+    def test_coalesced_results_match_uncoalesced(self):
+        """Coalescing keeps one BatchResult per batch."""
+        processor = BatchProcessor(BatchConfig(batch_size=2, coalesce_factor=3))
+        batches = processor.divide_into_batches(list(range(14)))
+
+        results = asyncio.run(processor.process_batches_async(batches, _failing_batch))
+        consolidated = processor.consolidate_results(results)
+
+        assert [r.batch_num for r in results] == list(range(1, 8))
+        assert consolidated["metadata"]["failed_batch_numbers"] == [2]
+        assert consolidated["data"] == [0, 1] + list(range(4, 14))
+
+    def test_invalid_coalesce_factor(self):
+        """coalesce_factor must be positive."""
+        with pytest.raises(ValueError):
+            BatchConfig(coalesce_factor=0)
+
+
+def _stuck_batch(batch_data, batch_num):
+    """Block batch 1 longer than the configured timeout."""
+    if batch_num == 1:
+        time.sleep(0.5)
+    return list(batch_data)
+
+
+class TestBatchTimeout:
+    """Tests for per-batch timeouts."""
+
+    @pytest.mark.parametrize("coalesce_factor", [1, 2])
+    def test_stuck_batch_times_out(self, coalesce_factor):
+        """A stuck batch is reported as a timeout without blocking the others."""
+        config = BatchConfig(batch_size=2, batch_timeout=0.1, coalesce_factor=coalesce_factor)
+        processor = BatchProcessor(config)
+        batches = processor.divide_into_batches(list(range(8)))
+
+        start = time.time()
+        results = asyncio.run(processor.process_batches_async(batches, _stuck_batch))
+
+        assert time.time() - start < 0.45
+        assert results[0].success is False
+        assert results[0].error == "timeout"
+        assert all(r.success for r in results[coalesce_factor:])
+
+    def test_group_timeout_keeps_finished_batches(self):
+        """Only the batches of a coalesced group that did not finish time out."""
+        def stuck_second(batch_data, batch_num):
+            if batch_num == 2:
+                time.sleep(0.5)
+            return list(batch_data)
+
+        config = BatchConfig(batch_size=2, batch_timeout=0.1, coalesce_factor=3)
+        processor = BatchProcessor(config)
+        batches = processor.divide_into_batches(list(range(6)))
+
+        results = asyncio.run(processor.process_batches_async(batches, stuck_second))
+        processor.shutdown()
+
+        assert results[0].success is True
+        assert results[0].data == [0, 1]
+        assert [r.error for r in results[1:]] == ["timeout", "timeout"]
+
+    def test_queued_batch_timeout_starts_with_worker(self):
+        """Waiting behind a timed-out batch for a worker does not count as timeout."""
+        config = BatchConfig(batch_size=2, max_parallel_batches=1, max_workers=1, batch_timeout=0.15)
+        processor = BatchProcessor(config)
+        batches = processor.divide_into_batches(list(range(4)))
+
+        results = asyncio.run(processor.process_batches_async(batches, _stuck_batch))
+        processor.shutdown()
+
+        assert results[0].error == "timeout"
+        assert results[1].success is True
+
+    def test_invalid_max_workers(self):
+        """The pool cannot be smaller than the admitted concurrency."""
+        with pytest.raises(ValueError):
+            BatchConfig(max_parallel_batches=4, max_workers=2)
+
+    def test_shutdown_releases_pool(self):
+        """shutdown() drops the pool and a later run creates a new one."""
+        processor = BatchProcessor(BatchConfig(batch_size=2))
+        batches = processor.divide_into_batches(list(range(4)))
+        asyncio.run(processor.process_batches_async(batches, _echo_batch))
+
+        processor.shutdown()
+        assert processor._executor is None
+
+        results = asyncio.run(processor.process_batches_async(batches, _echo_batch))
+        assert all(r.success for r in results)
+        processor.shutdown()
+
+    def test_shutdown_fails_queued_timed_batch(self):
+        """A batch cancelled by shutdown() before starting fails instead of hanging."""
+        config = BatchConfig(max_parallel_batches=1, max_workers=1, batch_timeout=5)
+        processor = BatchProcessor(config)
+        release = threading.Event()
+
+        async def run():
+            running = asyncio.ensure_future(processor._run_in_worker(release.wait, 5))
+            queued = asyncio.ensure_future(processor._run_in_worker(lambda: "late", 5))
+            await asyncio.sleep(0.05)
+            processor.shutdown(wait=False)
+            release.set()
+            with pytest.raises(RuntimeError):
+                await asyncio.wait_for(queued, timeout=1)
+            assert await running is True
+
+        asyncio.run(run())
+
+
+class TestLoopPolicy:
+    """Tests for the optional uvloop policy."""
+
+    def test_default_does_not_change_policy(self):
+        """Building a processor leaves the process-wide loop policy alone."""
+        policy = asyncio.get_event_loop_policy()
+
+        BatchProcessor()
+
+        assert asyncio.get_event_loop_policy() is policy
@@ -1,33 +1,24 @@
 """Tests for border cases using testing collections."""
 
 import pytest
-import requests
 from datetime import datetime, timedelta
-from app.clients.mongodb_client import MongoDBClient
 
 
 @pytest.fixture
-def setup_test_data(test_config, testing_collections):
-    """Setup test data in testing collections."""
-    client = MongoDBClient(
-        test_config["mongodb_uri"],
-        test_config["mongodb_database"]
-    )
-    client.connect()
-    
+def setup_test_data(mongodb_client, testing_collections):
+    """Clear the testing collections around each test, reusing the session client."""
     # Clear testing collections
-    client._database[testing_collections["executives"]].delete_many({})
-    client._database[testing_collections["memory"]].delete_many({})
+    mongodb_client._database[testing_collections["executives"]].delete_many({})
+    mongodb_client._database[testing_collections["memory"]].delete_many({})
     
-    yield client
+    yield mongodb_client
     
     # Cleanup after tests
-    client._database[testing_collections["executives"]].delete_many({})
-    client._database[testing_collections["memory"]].delete_many({})
-    client.disconnect()
+    mongodb_client._database[testing_collections["executives"]].delete_many({})
+    mongodb_client._database[testing_collections["memory"]].delete_many({})
 
 
-def test_zero_clients_available(setup_test_data, test_config, testing_collections):
+def test_zero_clients_available(setup_test_data, test_config, testing_collections, http_session):
     """Test behavior when 0 clients are available for recommendations."""
     client = setup_test_data
     
@@ -45,17 +36,19 @@ def test_zero_clients_available(setup_test_data, test_config, testing_collection
     client._database[testing_collections["executives"]].insert_one(exec_data)
     
     # Add recent recommendations for all clients
-    for rut in exec_data["rut_clientes"]:
-        client._database[testing_collections["memory"]].insert_one({
+    client._database[testing_collections["memory"]].insert_many([
+        {
             "executive_id": "9999",
             "client_id": str(rut),
             "recommendation": "Test recommendation",
             "embedding": [0.1] * 100,
             "timestamp": recent_date
-        })
+        }
+        for rut in exec_data["rut_clientes"]
+    ], ordered=False)
     
     # Call API and verify memory reset
-    response = requests.post(
+    response = http_session.post(
         f"{test_config['api_base_url']}/api/analyze",
         json={
             "current_date": current_date.strftime("%Y-%m-%d"),
@@ -70,7 +63,7 @@ def test_zero_clients_available(setup_test_data, test_config, testing_collection
     assert "data" in data
 
 
-def test_one_or_two_clients_available(setup_test_data, test_config, testing_collections):
+def test_one_or_two_clients_available(setup_test_data, test_config, testing_collections, http_session):
     """Test behavior when only 1-2 clients are available."""
     client = setup_test_data
     
@@ -88,17 +81,19 @@ def test_one_or_two_clients_available(setup_test_data, test_config, testing_coll
     client._database[testing_collections["executives"]].insert_one(exec_data)
     
     # Add recent recommendations for 3 clients (leaving 2 available)
-    for rut in [444444, 555555, 666666]:
-        client._database[testing_collections["memory"]].insert_one({
+    memory_docs = [
+        {
             "executive_id": "9998",
             "client_id": str(rut),
             "recommendation": "Recent recommendation",
             "embedding": [0.1] * 100,
             "timestamp": recent_date
-        })
+        }
+        for rut in [444444, 555555, 666666]
+    ]
     
     # Add old recommendation for 1 client
-    client._database[testing_collections["memory"]].insert_one({
+    memory_docs.append({
         "executive_id": "9998",
         "client_id": "777777",
         "recommendation": "Old recommendation",
@@ -106,7 +101,9 @@ def test_one_or_two_clients_available(setup_test_data, test_config, testing_coll
         "timestamp": old_date
     })
     
-    response = requests.post(
+    client._database[testing_collections["memory"]].insert_many(memory_docs, ordered=False)
+    
+    response = http_session.post(
         f"{test_config['api_base_url']}/api/analyze",
         json={
             "current_date": current_date.strftime("%Y-%m-%d"),
@@ -121,7 +118,7 @@ def test_one_or_two_clients_available(setup_test_data, test_config, testing_coll
     assert "data" in data
 
 
-def test_cooldown_period(setup_test_data, test_config, testing_collections):
+def test_cooldown_period(setup_test_data, test_config, testing_collections, http_session):
     """Test cooldown period prevents recent recommendations."""
     client = setup_test_data
     
@@ -138,25 +135,26 @@ def test_cooldown_period(setup_test_data, test_config, testing_collections):
     
     client._database[testing_collections["executives"]].insert_one(exec_data)
     
-    # Client within cooldown
-    client._database[testing_collections["memory"]].insert_one({
-        "executive_id": "9997",
-        "client_id": "111222",
-        "recommendation": "Within cooldown",
-        "embedding": [0.1] * 100,
-        "timestamp": within_cooldown
-    })
-    
-    # Client outside cooldown
-    client._database[testing_collections["memory"]].insert_one({
-        "executive_id": "9997",
-        "client_id": "333444",
-        "recommendation": "Outside cooldown",
-        "embedding": [0.2] * 100,
-        "timestamp": outside_cooldown
-    })
+    client._database[testing_collections["memory"]].insert_many([
+        # Client within cooldown
+        {
+            "executive_id": "9997",
+            "client_id": "111222",
+            "recommendation": "Within cooldown",
+            "embedding": [0.1] * 100,
+            "timestamp": within_cooldown
+        },
+        # Client outside cooldown
+        {
+            "executive_id": "9997",
+            "client_id": "333444",
+            "recommendation": "Outside cooldown",
+            "embedding": [0.2] * 100,
+            "timestamp": outside_cooldown
+        }
+    ], ordered=False)
     
-    response = requests.post(
+    response = http_session.post(
         f"{test_config['api_base_url']}/api/analyze",
         json={
             "current_date": current_date.strftime("%Y-%m-%d"),
@@ -171,7 +169,7 @@ def test_cooldown_period(setup_test_data, test_config, testing_collections):
     assert "data" in data
 
 
-def test_different_recommendations_each_day(setup_test_data, test_config, testing_collections):
+def test_different_recommendations_each_day(setup_test_data, test_config, testing_collections, http_session):
     """Test that different clients are recommended each day."""
     client = setup_test_data
     
@@ -186,7 +184,7 @@ def test_different_recommendations_each_day(setup_test_data, test_config, testin
     
     # Day 1
     day1 = datetime.utcnow()
-    response1 = requests.post(
+    response1 = http_session.post(
         f"{test_config['api_base_url']}/api/analyze",
         json={
             "current_date": day1.strftime("%Y-%m-%d"),
@@ -199,7 +197,7 @@ def test_different_recommendations_each_day(setup_test_data, test_config, testin
     
     # Day 2 (next day)
     day2 = day1 + timedelta(days=1)
-    response2 = requests.post(
+    response2 = http_session.post(
         f"{test_config['api_base_url']}/api/analyze",
         json={
             "current_date": day2.strftime("%Y-%m-%d"),
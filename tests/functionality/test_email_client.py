@@ -0,0 +1,128 @@
+"""
+Unit tests for SendGridEmailClient's pooled connections.
+
+The HTTP sessions are replaced with fakes, so no request reaches SendGrid.
+"""
+
+import pytest
+import requests
+from sendgrid.helpers.mail import Mail
+from app.clients.email_client import SendGridEmailClient
+
+
+class FakeResponse:
+    """Accepted SendGrid response."""
+
+    status_code = 202
+
+    def raise_for_status(self) -> None:
+        pass
+
+
+class FakeHttp:
+    """Stand-in for requests.Session that records posts."""
+
+    def __init__(self, error: Exception = None):
+        self.error = error
+        self.posts = 0
+        self.closed = False
+
+    def post(self, url, data, timeout):
+        self.posts += 1
+        if self.error is not None:
+            raise self.error
+        return FakeResponse()
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class FakeSendGridClient(SendGridEmailClient):
+    """Client whose pooled connections are FakeHttp objects."""
+
+    def __init__(self, errors=(), **kwargs):
+        super().__init__("key", "from@test.local", pool_size=1, **kwargs)
+        self.errors = list(errors)
+        self.opened = []
+
+    def _open_http_session(self):
+        http = FakeHttp(self.errors.pop(0) if self.errors else None)
+        self.opened.append(http)
+        return http
+
+
+def send(client):
+    return client.send_email("to@test.local", "Asunto", "<p>Hola</p>")
+
+
+class TestConnectionFailures:
+    """Tests for errors while posting a message."""
+
+    def test_aborted_send_is_not_retried(self):
+        """A dropped connection fails the send instead of posting the message twice."""
+        client = FakeSendGridClient(errors=[requests.ConnectionError("Connection aborted")])
+
+        with client.session():
+            with pytest.raises(requests.ConnectionError):
+                send(client)
+
+            broken = client.opened[0]
+            assert broken.posts == 1
+            assert broken.closed
+
+            # The pool holds a fresh connection for the next message
+            assert send(client)["success"] is True
+            assert client.opened[1].posts == 1
+
+    def test_only_connect_errors_are_retried(self):
+        """Real sessions retry connection setup but never reads."""
+        client = SendGridEmailClient("key", "from@test.local")
+
+        retry = client._open_http_session().get_adapter("https://api.sendgrid.com").max_retries
+
+        assert retry.connect == 1
+        assert retry.read == 0
+        assert retry.other == 0
+
+
+class TestClosingThePool:
+    """Tests for close() while sends are in progress."""
+
+    def test_connection_returned_after_close_is_closed(self):
+        """A connection checked out during close() is closed, not re-queued."""
+        client = FakeSendGridClient(keep_alive=True)
+
+        with client.session():
+            pool = client._connection_pool
+            connection = client._checkout(pool)
+
+            client.close()
+            client._release(pool, connection)
+
+        assert connection.http.closed
+        assert pool.empty()
+
+    def test_send_waiting_on_closed_pool_falls_back(self, monkeypatch):
+        """A send queued on a pool that gets closed uses the SDK instead of blocking."""
+        client = FakeSendGridClient(keep_alive=True)
+        monkeypatch.setattr(client._client, "send", lambda message: FakeResponse())
+
+        with client.session():
+            pool = client._connection_pool
+            client._checkout(pool)  # The only connection is busy
+            client.close()
+
+            message = Mail(from_email="from@test.local", to_emails="to@test.local",
+                           subject="Asunto", html_content="<p>Hola</p>")
+            assert client._post_message(message, pool) == 202
+
+    def test_send_after_close_uses_sdk(self, monkeypatch):
+        """send_email after close() does not touch the closed pool."""
+        client = FakeSendGridClient(keep_alive=True)
+        monkeypatch.setattr(client._client, "send", lambda message: FakeResponse())
+
+        with client.session():
+            pass
+        client.close()
+
+        assert send(client)["status_code"] == 202
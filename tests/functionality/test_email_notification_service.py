@@ -0,0 +1,328 @@
+"""
+Unit tests for EmailNotificationService.
+
+These tests use an in-memory email client to verify how notifications are
+built and sent, without contacting SendGrid.
+"""
+
+import asyncio
+import hashlib
+import pytest
+from contextlib import contextmanager
+from typing import Dict, Any, Optional
+from app.clients.email_client import IEmailClient
+from app.services.email_notification_service import EmailNotificationService, _format_money, normalize_prioridad
+
+
+class MockEmailClient(IEmailClient):
+    """Mock email client that records sent emails."""
+
+    def __init__(self, fail_for: Optional[set] = None):
+        self.fail_for = fail_for or set()
+        self.sent = []
+        self.sessions_opened = 0
+        self.in_session = False
+
+    @contextmanager
+    def session(self):
+        self.sessions_opened += 1
+        self.in_session = True
+        try:
+            yield self
+        finally:
+            self.in_session = False
+
+    def send_email(
+        self,
+        to_email: str,
+        subject: str,
+        html_content: str,
+        from_email: Optional[str] = None
+    ) -> Dict[str, Any]:
+        if to_email in self.fail_for:
+            raise ConnectionError(f"Cannot deliver to {to_email}")
+        self.sent.append({
+            "to_email": to_email,
+            "subject": subject,
+            "html_content": html_content,
+            "in_session": self.in_session
+        })
+        return {
+            "success": True,
+            "status_code": 202,
+            "message": "Email sent successfully",
+            "recipient": to_email,
+            "original_recipient": None
+        }
+
+
+def make_ejecutivo(i: int, **overrides) -> Dict[str, Any]:
+    """Build a minimal ejecutivo analysis entry."""
+    ejecutivo = {
+        "nombre": f"Ejecutivo {i}",
+        "correo": f"exec{i}@test.local",
+        "estado": "Buen ritmo",
+        "metricas": {"ventas_acumuladas": 1500000, "meta_mes": 3000000, "avance_porcentual": 0.5},
+        "cartera": {"total_clientes": 10, "clientes_activos": 8},
+        "diagnostico": "Diagnóstico de prueba",
+        "sugerencias_clientes": [
+            {"prioridad": "ALTA", "cliente_nombre": "Cliente A", "cliente_rut": "1-9", "accion": "Llamar", "razon": "Riesgo"}
+        ],
+        "alertas": ["Alerta de prueba"]
+    }
+    ejecutivo.update(overrides)
+    return ejecutivo
+
+
+@pytest.fixture
+def email_client():
+    """Create a MockEmailClient."""
+    return MockEmailClient()
+
+
+@pytest.fixture
+def service(email_client):
+    """Create an EmailNotificationService backed by the mock client."""
+    return EmailNotificationService(email_client)
+
+
+class TestSendAnalysisNotifications:
+    """Tests for send_analysis_notifications."""
+
+    def test_sends_one_email_per_ejecutivo(self, service, email_client):
+        """Every ejecutivo with an email receives one message."""
+        analysis = {"data": {"ejecutivos": [make_ejecutivo(i) for i in range(3)]}}
+
+        result = service.send_analysis_notifications(analysis, "2026-02-25")
+
+        assert result["total_sent"] == 3
+        assert result["total_failed"] == 0
+        assert [e["to_email"] for e in email_client.sent] == [
+            "exec0@test.local", "exec1@test.local", "exec2@test.local"
+        ]
+
+    def test_all_sends_share_one_session(self, service, email_client):
+        """The client connection is opened once for the whole run."""
+        analysis = {"data": {"ejecutivos": [make_ejecutivo(i) for i in range(3)]}}
+
+        service.send_analysis_notifications(analysis, "2026-02-25")
+
+        assert email_client.sessions_opened == 1
+        assert all(e["in_session"] for e in email_client.sent)
+
+    def test_missing_email_is_failed(self, service, email_client):
+        """Ejecutivos without an email address are reported as failed."""
+        analysis = {"data": {"ejecutivos": [make_ejecutivo(0, correo=None)]}}
+
+        result = service.send_analysis_notifications(analysis, "2026-02-25")
+
+        assert result["total_failed"] == 1
+        assert result["notifications"][0]["error"] == "No email address found"
+        assert email_client.sent == []
+
+    def test_testing_mode_skips_without_test_correo(self, service, email_client):
+        """In testing mode only ejecutivos with test_correo are sent."""
+        analysis = {"data": {"ejecutivos": [
+            make_ejecutivo(0),
+            make_ejecutivo(1, test_correo="qa@test.local")
+        ]}}
+
+        result = service.send_analysis_notifications(analysis, "2026-02-25", is_testing=True)
+
+        assert result["total_sent"] == 1
+        assert result["total_skipped"] == 1
+        assert email_client.sent[0]["to_email"] == "qa@test.local"
+        assert email_client.sent[0]["subject"].startswith("[TEST]")
+
+    def test_client_error_is_recorded(self):
+        """Exceptions from the client are recorded as failed notifications."""
+        email_client = MockEmailClient(fail_for={"exec1@test.local"})
+        service = EmailNotificationService(email_client)
+        analysis = {"data": {"ejecutivos": [make_ejecutivo(i) for i in range(3)]}}
+
+        result = service.send_analysis_notifications(analysis, "2026-02-25")
+
+        assert result["total_sent"] == 2
+        assert result["total_failed"] == 1
+        assert "Cannot deliver" in result["notifications"][1]["error"]
+
+    def test_no_ejecutivos(self, service):
+        """An empty analysis sends nothing."""
+        result = service.send_analysis_notifications({"data": {}}, "2026-02-25")
+
+        assert result == {"total_sent": 0, "total_failed": 0, "total_skipped": 0, "notifications": []}
+
+    def test_records_body_digest_not_body(self, service, email_client):
+        """Notification records carry a digest of the HTML, not the HTML itself."""
+        analysis = {"data": {"ejecutivos": [make_ejecutivo(0)]}}
+
+        result = service.send_analysis_notifications(analysis, "2026-02-25")
+
+        notification = result["notifications"][0]
+        assert "body" not in notification
+        assert notification["body_sha1"] == hashlib.sha1(
+            email_client.sent[0]["html_content"].encode("utf-8")
+        ).hexdigest()
+
+    def test_async_send_matches_sync(self, service, email_client):
+        """The async variant returns the same summary as the sync one."""
+        analysis = {"data": {"ejecutivos": [make_ejecutivo(i) for i in range(3)]}}
+
+        result = asyncio.run(service.send_analysis_notifications_async(analysis, "2026-02-25"))
+
+        assert result["total_sent"] == 3
+        assert len(email_client.sent) == 3
+
+    def test_iter_notifications_is_lazy(self, service, email_client):
+        """Emails are sent as the generator is consumed."""
+        analysis = {"data": {"ejecutivos": [make_ejecutivo(i) for i in range(3)]}}
+
+        notifications = service.iter_analysis_notifications(analysis, "2026-02-25")
+        assert email_client.sent == []
+
+        first = next(notifications)
+        assert first["status"] == "success"
+        assert len(email_client.sent) == 1
+        assert email_client.in_session
+
+        notifications.close()
+        assert not email_client.in_session
+
+
+class TestFormatEmailHtml:
+    """Tests for the generated HTML body."""
+
+    def test_contains_ejecutivo_data(self, service):
+        """Name, date, amounts, sugerencias and alertas are rendered."""
+        html = service._format_email_html(make_ejecutivo(7), "2026-02-25")
+
+        assert html.startswith("<!DOCTYPE html>")
+        assert "Ejecutivo 7" in html
+        assert "2026-02-25" in html
+        assert "$1,500,000" in html
+        assert "Cliente A" in html
+        assert "Alerta de prueba" in html
+        assert "#17a2b8" in html  # "Buen" status color
+        assert html.rstrip().endswith("</html>")
+
+    def test_without_sugerencias(self, service):
+        """A placeholder is shown when there are no sugerencias."""
+        html = service._format_email_html(make_ejecutivo(1, sugerencias_clientes=[], alertas=[]), "2026-02-25")
+
+        assert "No hay sugerencias en este momento." in html
+        assert "Alertas Importantes" not in html
+
+    def test_status_keyword_precedence(self, service):
+        """With several status keywords, the highest one picks the color."""
+        html = service._format_email_html(
+            make_ejecutivo(1, estado="Ritmo justo pero Excelente cierre"), "2026-02-25"
+        )
+
+        assert "#28a745" in html
+        assert "🟢" in html
+
+    def test_null_sugerencias(self, service):
+        """Explicit nulls from the model render like empty lists."""
+        html = service._format_email_html(make_ejecutivo(1, sugerencias_clientes=None, alertas=None), "2026-02-25")
+
+        assert "No hay sugerencias en este momento." in html
+        assert "Alertas Importantes" not in html
+
+    def test_non_serializable_payload_is_rendered(self, service):
+        """Payloads with values that are not JSON serializable are rendered."""
+        html = service._format_email_html(make_ejecutivo(1, fecha=object()), "2026-02-25")
+
+        assert "Ejecutivo 1" in html
+
+
+class TestParallelSends:
+    """Tests for concurrent sending with max_workers > 1."""
+
+    def test_parallel_sends_keep_order(self):
+        """Notifications are returned in ejecutivo order."""
+        email_client = MockEmailClient(fail_for={"exec3@test.local"})
+        service = EmailNotificationService(email_client, max_workers=4)
+        analysis = {"data": {"ejecutivos": [make_ejecutivo(i) for i in range(10)]}}
+
+        result = service.send_analysis_notifications(analysis, "2026-02-25")
+
+        assert result["total_sent"] == 9
+        assert result["total_failed"] == 1
+        assert [n["ejecutivo"] for n in result["notifications"]] == [f"Ejecutivo {i}" for i in range(10)]
+        assert email_client.sessions_opened == 1
+
+    def test_invalid_max_workers(self, email_client):
+        """max_workers must be positive."""
+        with pytest.raises(ValueError):
+            EmailNotificationService(email_client, max_workers=0)
+
+
+class TestAbortOnFailures:
+    """Tests for aborting a run when too many sends fail."""
+
+    def test_aborts_after_a_third_fail(self):
+        """With 30+ ejecutivos, the run stops once a third have failed."""
+        email_client = MockEmailClient(fail_for={f"exec{i}@test.local" for i in range(30)})
+        service = EmailNotificationService(email_client)
+        analysis = {"data": {"ejecutivos": [make_ejecutivo(i) for i in range(30)]}}
+
+        result = service.send_analysis_notifications(analysis, "2026-02-25")
+
+        assert result["total_failed"] == 10
+        assert result["total_skipped"] == 20
+        assert result["notifications"][10]["error"] == "batch aborted after >=1/3 failures"
+        assert [n["ejecutivo"] for n in result["notifications"]] == [f"Ejecutivo {i}" for i in range(30)]
+
+    def test_parallel_abort_reports_every_ejecutivo(self):
+        """In parallel mode in-flight sends are kept and the rest skipped, in order."""
+        email_client = MockEmailClient(fail_for={f"exec{i}@test.local" for i in range(60)})
+        service = EmailNotificationService(email_client, max_workers=4)
+        analysis = {"data": {"ejecutivos": [make_ejecutivo(i) for i in range(60)]}}
+
+        result = service.send_analysis_notifications(analysis, "2026-02-25")
+
+        assert result["total_failed"] >= 20
+        assert result["total_failed"] + result["total_skipped"] == 60
+        assert [n["ejecutivo"] for n in result["notifications"]] == [f"Ejecutivo {i}" for i in range(60)]
+        assert all(n["error"] == "batch aborted after >=1/3 failures"
+                   for n in result["notifications"] if n["status"] == "skipped")
+
+    def test_small_runs_are_not_aborted(self):
+        """Runs below 30 ejecutivos always try every recipient."""
+        email_client = MockEmailClient(fail_for={f"exec{i}@test.local" for i in range(29)})
+        service = EmailNotificationService(email_client)
+        analysis = {"data": {"ejecutivos": [make_ejecutivo(i) for i in range(29)]}}
+
+        result = service.send_analysis_notifications(analysis, "2026-02-25")
+
+        assert result["total_failed"] == 29
+        assert result["total_skipped"] == 0
+
+
+class TestNormalizePrioridad:
+    """Tests for priority normalization."""
+
+    @pytest.mark.parametrize("raw,expected", [
+        ("crítica", "CRÍTICA"),
+        ("Alta", "ALTA"),
+        ("MEDIA", "MEDIA"),
+        ("Urgente", "Urgente"),
+        (None, None)
+    ])
+    def test_normalize(self, raw, expected):
+        """Known priorities are upper-cased, anything else is left as is."""
+        assert normalize_prioridad(raw) == expected
+
+
+class TestFormatMoney:
+    """Tests for amount formatting."""
+
+    @pytest.mark.parametrize("value", [0, 1234567.5, 2.5, -1500.49, float("nan"), float("inf"), float("-inf")])
+    def test_matches_fixed_point_format(self, value):
+        """Amounts, including NaN and infinities, render like "{:,.0f}" unless they round to -0."""
+        assert _format_money(value) == "{:,.0f}".format(value)
+
+    @pytest.mark.parametrize("value", [-0.4, -0.5, -1e-9, -0.0])
+    def test_negative_zero_is_unsigned(self, value):
+        """Amounts rounding to zero from below render as "0", not "-0"."""
+        assert _format_money(value) == "0"
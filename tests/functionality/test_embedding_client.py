@@ -0,0 +1,111 @@
+"""
+Unit tests for EmbeddingClient caching.
+
+A fake HTTP session stands in for the embedding API, so the tests count
+requests without any network access.
+"""
+
+import pytest
+from typing import Any, Dict, List
+from app.clients.embedding_client import EmbeddingClient
+
+
+class FakeResponse:
+    """Minimal response object with the embedding API payload."""
+
+    def __init__(self, embeddings: List[List[float]]):
+        self._embeddings = embeddings
+
+    def raise_for_status(self) -> None:
+        pass
+
+    def json(self) -> Dict[str, Any]:
+        return {"data": [{"embedding": e} for e in self._embeddings]}
+
+
+class FakeSession:
+    """Session that embeds each text as [len(text), 0.5] and records requests."""
+
+    def __init__(self):
+        self.requests = []
+
+    def post(self, url: str, json: Dict[str, Any], timeout: int) -> FakeResponse:
+        self.requests.append(json["input"])
+        texts = json["input"] if isinstance(json["input"], list) else [json["input"]]
+        return FakeResponse([[float(len(text)), 0.5] for text in texts])
+
+
+def make_client(cache_dir=None, model_name="test-model") -> EmbeddingClient:
+    """Build a client wired to a FakeSession."""
+    client = EmbeddingClient("key", "https://embeddings.test", model_name, cache_dir=cache_dir)
+    client._session = FakeSession()
+    return client
+
+
+class TestEmbeddingCache:
+    """Tests for the content-hash embedding cache."""
+
+    def test_no_cache_by_default(self):
+        """Without cache_dir every call reaches the API."""
+        client = make_client()
+
+        client.generate_embedding("hola")
+        client.generate_embedding("hola")
+
+        assert client._session.requests == ["hola", "hola"]
+
+    def test_repeated_text_served_from_memory(self, tmp_path):
+        """A repeated text is requested once."""
+        client = make_client(cache_dir=str(tmp_path))
+
+        first = client.generate_embedding("hola")
+        second = client.generate_embedding("hola")
+
+        assert first == second == [4.0, 0.5]
+        assert client._session.requests == ["hola"]
+
+    def test_disk_cache_shared_between_clients(self, tmp_path):
+        """A new client reuses embeddings written by a previous one."""
+        make_client(cache_dir=str(tmp_path)).generate_embedding("hola")
+
+        client = make_client(cache_dir=str(tmp_path))
+        embedding = client.generate_embedding("hola")
+
+        assert embedding == [4.0, 0.5]
+        assert all(isinstance(x, float) for x in embedding)
+        assert client._session.requests == []
+
+    def test_model_change_misses_cache(self, tmp_path):
+        """Embeddings from another model are not reused."""
+        make_client(cache_dir=str(tmp_path)).generate_embedding("hola")
+
+        client = make_client(cache_dir=str(tmp_path), model_name="other-model")
+        client.generate_embedding("hola")
+
+        assert client._session.requests == ["hola"]
+
+    def test_batch_requests_only_missing_texts(self, tmp_path):
+        """Batch calls send only uncached texts and keep input order."""
+        client = make_client(cache_dir=str(tmp_path))
+        client.generate_embedding("bb")
+
+        embeddings = client.generate_embeddings_batch(["a", "bb", "ccc"])
+
+        assert embeddings == [[1.0, 0.5], [2.0, 0.5], [3.0, 0.5]]
+        assert client._session.requests == ["bb", ["a", "ccc"]]
+
+    def test_batch_fully_cached_makes_no_request(self, tmp_path):
+        """A batch of cached texts does not call the API."""
+        client = make_client(cache_dir=str(tmp_path))
+        client.generate_embeddings_batch(["a", "bb"])
+
+        client.generate_embeddings_batch(["bb", "a"])
+
+        assert client._session.requests == [["a", "bb"]]
+
+    def test_empty_text_still_rejected(self, tmp_path):
+        """Validation runs before the cache lookup."""
+        client = make_client(cache_dir=str(tmp_path))
+
+        with pytest.raises(ValueError):
+            client.generate_embedding("   ")
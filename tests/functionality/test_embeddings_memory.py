@@ -2,7 +2,6 @@
 
 import pytest
 from app.clients.embedding_client import EmbeddingClient
-from app.clients.mongodb_client import MongoDBClient
 from app.services.recommendation_memory_store import RecommendationMemoryStore
 from app.services.similarity_service import SimilarityService
 
@@ -12,7 +11,8 @@ def test_embedding_generation(test_config):
     client = EmbeddingClient(
         test_config["embedding_api_key"],
         test_config["embedding_endpoint"],
-        test_config["embedding_model_name"]
+        test_config["embedding_model_name"],
+        cache_dir=test_config["embedding_cache_dir"]
     )
     client.connect()
     
@@ -29,7 +29,8 @@ def test_similarity_computation(test_config):
     client = EmbeddingClient(
         test_config["embedding_api_key"],
         test_config["embedding_endpoint"],
-        test_config["embedding_model_name"]
+        test_config["embedding_model_name"],
+        cache_dir=test_config["embedding_cache_dir"]
     )
     client.connect()
     
@@ -52,18 +53,15 @@ def test_similarity_computation(test_config):
     assert sim_13 < sim_12  # Should be less similar
 
 
-def test_no_duplicate_recommendations(test_config, testing_collections):
+def test_no_duplicate_recommendations(test_config, testing_collections, mongodb_client):
     """Test that similar recommendations are filtered out."""
-    mongo_client = MongoDBClient(
-        test_config["mongodb_uri"],
-        test_config["mongodb_database"]
-    )
-    mongo_client.connect()
+    mongo_client = mongodb_client
     
     embedding_client = EmbeddingClient(
         test_config["embedding_api_key"],
         test_config["embedding_endpoint"],
-        test_config["embedding_model_name"]
+        test_config["embedding_model_name"],
+        cache_dir=test_config["embedding_cache_dir"]
     )
     embedding_client.connect()
     
@@ -116,21 +114,17 @@ def test_no_duplicate_recommendations(test_config, testing_collections):
     
     # Cleanup
     mongo_client._database[testing_collections["memory"]].delete_many({})
-    mongo_client.disconnect()
 
 
-def test_memory_store_retrieval(test_config, testing_collections):
+def test_memory_store_retrieval(test_config, testing_collections, mongodb_client):
     """Test memory store can retrieve historical recommendations."""
-    mongo_client = MongoDBClient(
-        test_config["mongodb_uri"],
-        test_config["mongodb_database"]
-    )
-    mongo_client.connect()
+    mongo_client = mongodb_client
     
     embedding_client = EmbeddingClient(
         test_config["embedding_api_key"],
         test_config["embedding_endpoint"],
-        test_config["embedding_model_name"]
+        test_config["embedding_model_name"],
+        cache_dir=test_config["embedding_cache_dir"]
     )
     embedding_client.connect()
     
@@ -142,13 +136,11 @@ def test_memory_store_retrieval(test_config, testing_collections):
     # Clear testing collection
     mongo_client._database[testing_collections["memory"]].delete_many({})
     
-    # Store multiple recommendations
-    for i in range(5):
-        memory_store.store_recommendation(
-            executive_id="TEST002",
-            client_id="87654321",
-            recommendation_text=f"Recommendation {i+1}"
-        )
+    # Store multiple recommendations (one embedding request, one insert_many)
+    memory_store.store_recommendations([
+        ("TEST002", "87654321", f"Recommendation {i+1}", None)
+        for i in range(5)
+    ])
     
     # Retrieve with limit
     historical = memory_store.get_historical_recommendations(
@@ -163,4 +155,35 @@ def test_memory_store_retrieval(test_config, testing_collections):
     
     # Cleanup
     mongo_client._database[testing_collections["memory"]].delete_many({})
-    mongo_client.disconnect()
+
+
+class _FlakyBatchClient:
+    """Data client whose batch insert always fails and rejects one document."""
+    
+    def __init__(self, rejected_text):
+        self.rejected_text = rejected_text
+        self.stored = []
+    
+    def insert_many(self, collection_name, documents):
+        raise RuntimeError("batch write failed")
+    
+    def insert_one(self, collection_name, document):
+        if document["recommendation"] == self.rejected_text:
+            raise RuntimeError("write failed")
+        self.stored.append(document)
+        return f"id-{len(self.stored)}"
+
+
+def test_store_recommendations_falls_back_to_single_inserts(monkeypatch):
+    """A failed batch insert stores what it can instead of dropping every item."""
+    monkeypatch.setattr("app.services.recommendation_memory_store.time.sleep", lambda _: None)
+    data_client = _FlakyBatchClient(rejected_text="Recommendation 2")
+    memory_store = RecommendationMemoryStore(data_client=data_client, embedding_client=object())
+    
+    stored_ids = memory_store.store_recommendations(
+        [("TEST003", "11111111", f"Recommendation {i+1}", None) for i in range(3)],
+        embeddings=[[1.0, 0.0], [0.0, 1.0], [1.0, 1.0]]
+    )
+    
+    assert stored_ids == ["id-1", "id-2"]
+    assert [doc["recommendation"] for doc in data_client.stored] == ["Recommendation 1", "Recommendation 3"]
@@ -85,6 +85,9 @@ class TestDependencySetup:
         settings = Mock(spec=Settings)
         settings.mongodb_uri = 'mongodb://localhost:27017'
         settings.mongodb_database = 'test_db'
+        settings.mongodb_max_pool_size = 15
+        settings.mongodb_min_pool_size = 2
+        settings.mongodb_wait_queue_timeout_ms = 2000
         settings.aws_region = 'us-east-1'
         settings.aws_bedrock_model_id = 'arn:aws:bedrock:us-east-1::inference-profile/amazon-nova-lite-v1'
         settings.memory_enabled = False  # Disable memory for tests
@@ -100,7 +103,10 @@ class TestDependencySetup:
             # Verify clients were created with correct parameters
             mock_mongo_client.assert_called_once_with(
                 'mongodb://localhost:27017',
-                'test_db'
+                'test_db',
+                max_pool_size=15,
+                min_pool_size=2,
+                wait_queue_timeout_ms=2000
             )
             
             mock_ai_client.assert_called_once_with(
@@ -121,6 +127,9 @@ class TestDependencySetup:
         settings = Mock(spec=Settings)
         settings.mongodb_uri = 'mongodb://localhost:27017'
         settings.mongodb_database = 'test_db'
+        settings.mongodb_max_pool_size = 15
+        settings.mongodb_min_pool_size = 2
+        settings.mongodb_wait_queue_timeout_ms = 2000
         settings.aws_region = 'us-east-1'
         settings.aws_bedrock_model_id = 'arn:aws:bedrock:us-east-1::inference-profile/amazon-nova-lite-v1'
         settings.memory_enabled = False  # Disable memory for tests
@@ -194,6 +203,28 @@ class TestApplicationLifecycle:
                 # Verify disconnect was called
                 mock_mongo_instance.disconnect.assert_called_once()
     
+    def test_lifespan_shuts_down_analysis_service(self):
+        """Test that batch worker threads are released on shutdown."""
+        with patch.dict(os.environ, {
+            'MONGODB_URI': 'mongodb://localhost:27017',
+            'MONGODB_DATABASE': 'test_db',
+            'AWS_REGION': 'us-east-1',
+            'AWS_BEDROCK_MODEL_ID': 'arn:aws:bedrock:us-east-1::inference-profile/amazon-nova-lite-v1'
+        }):
+            with patch('app.main.MongoDBClient'), \
+                 patch('app.main.AWSBedrockClient'), \
+                 patch('app.main.AnalysisService') as mock_service:
+                
+                mock_service_instance = Mock()
+                mock_service.return_value = mock_service_instance
+                
+                app = create_app()
+                
+                with TestClient(app) as client:
+                    mock_service_instance.shutdown.assert_not_called()
+                
+                mock_service_instance.shutdown.assert_called_once()
+    
     def test_lifespan_handles_connection_errors_gracefully(self):
         """Test that lifespan handles connection errors during startup."""
         with patch.dict(os.environ, {
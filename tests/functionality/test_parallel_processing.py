@@ -226,16 +226,14 @@ class TestEmailTestingMode:
     """Tests for email testing mode with test_correo field."""
     
     @pytest.mark.integration
-    def test_test_correo_field_preserved(self, test_config):
+    def test_test_correo_field_preserved(self, test_config, http_session):
         """Test that test_correo field is preserved through analysis."""
         # This test requires MongoDB connection
         if not test_config.get("mongodb_uri"):
             pytest.skip("MongoDB not configured")
         
         # Make API call with is_testing=true
-        import requests
-        
-        response = requests.post(
+        response = http_session.post(
             f"{test_config['api_base_url']}/api/analyze",
             json={"current_date": "2026-02-25", "is_testing": True},
             timeout=300
@@ -262,14 +260,12 @@ class TestEmailTestingMode:
                 assert notif.get("test_correo") is not None
                 assert notif.get("test_mode") is True
     
-    def test_testing_mode_filters_correctly(self, test_config):
+    def test_testing_mode_filters_correctly(self, test_config, http_session):
         """Test that testing mode only sends to executives with test_correo."""
         if not test_config.get("mongodb_uri"):
             pytest.skip("MongoDB not configured")
         
-        import requests
-        
-        response = requests.post(
+        response = http_session.post(
             f"{test_config['api_base_url']}/api/analyze",
             json={"current_date": "2026-02-25", "is_testing": True},
             timeout=300
@@ -292,7 +288,7 @@ class TestEmailTestingMode:
 
 
 @pytest.fixture
-def test_config():
+def test_config(load_env):
     """Provide test configuration."""
     return {
         "mongodb_uri": os.getenv("MONGODB_URI"),
@@ -5,6 +5,7 @@ This module contains tests for the AST-based Python parser that extracts
 classes, methods, and functions from Python source files.
 """
 
+import sys
 import pytest
 import tempfile
 from pathlib import Path
@@ -12,7 +13,8 @@ from app.utils.python_parser import (
     PythonFileParser,
     ParseResult,
     ClassInfo,
-    FunctionInfo
+    FunctionInfo,
+    main
 )
 
 
@@ -22,6 +24,12 @@ def parser():
     return PythonFileParser()
 
 
+@pytest.fixture
+def cached_parser(tmp_path):
+    """Create a PythonFileParser with a cache file."""
+    return PythonFileParser(cache_path=str(tmp_path / "parse_cache.pkl"))
+
+
 @pytest.fixture
 def temp_python_file():
     """Create a temporary Python file for testing."""
@@ -198,6 +206,33 @@ class Child(Parent):
         assert len(child.base_classes) == 1
         assert child.base_classes[0] == "Parent"
     
+    def test_parse_respects_coding_declaration(self, parser, tmp_path):
+        """Test that files with a PEP 263 coding line are decoded correctly."""
+        path = tmp_path / "latin.py"
+        path.write_bytes(
+            '# -*- coding: latin-1 -*-\ndef f():\n    """Año."""\n'.encode('latin-1')
+        )
+        
+        result = parser.parse_file(str(path))
+        
+        assert result.parse_error is None
+        assert result.functions[0].docstring == "Año."
+    
+    def test_parse_dotted_base_classes(self, parser, temp_python_file):
+        """Test that qualified base classes keep their full dotted name."""
+        code = '''
+import a
+
+class Deep(a.b.c.Base, a.Mixin):
+    pass
+'''
+        temp_python_file.write(code)
+        temp_python_file.flush()
+        
+        result = parser.parse_file(temp_python_file.name)
+        
+        assert result.classes[0].base_classes == ["a.b.c.Base", "a.Mixin"]
+    
     def test_parse_mixed_content(self, parser, temp_python_file):
         """Test parsing a file with both classes and functions."""
         code = '''
@@ -231,6 +266,62 @@ def another_function():
         assert result.functions[1].name == "another_function"
         assert result.classes[0].name == "MyClass"
     
+    def test_parse_only_module_level_definitions(self, parser, temp_python_file):
+        """Test that nested functions and classes are not reported."""
+        code = '''
+def outer():
+    def inner():
+        pass
+    class Local:
+        pass
+
+class Outer:
+    class Nested:
+        def nested_method(self):
+            pass
+    
+    def method(self):
+        def helper():
+            pass
+'''
+        temp_python_file.write(code)
+        temp_python_file.flush()
+        
+        result = parser.parse_file(temp_python_file.name)
+        
+        assert [f.name for f in result.functions] == ["outer"]
+        assert [c.name for c in result.classes] == ["Outer"]
+        assert [m.name for m in result.classes[0].methods] == ["method"]
+    
+    def test_parse_does_not_walk_whole_tree(self, parser, temp_python_file, monkeypatch):
+        """Test that each definition is visited once, without ast.walk."""
+        import ast
+        
+        def fail_walk(node):
+            raise AssertionError("ast.walk should not be used")
+        
+        monkeypatch.setattr(ast, "walk", fail_walk)
+        temp_python_file.write("class A:\n    def m(self):\n        pass\n\ndef f():\n    pass\n")
+        temp_python_file.flush()
+        
+        result = parser.parse_file(temp_python_file.name)
+        
+        assert result.parse_error is None
+        assert [m.name for m in result.classes[0].methods] == ["m"]
+        assert [f.name for f in result.functions] == ["f"]
+    
+    def test_parse_without_docstrings(self, parser, temp_python_file):
+        """Test that docstrings can be skipped when only names are needed."""
+        temp_python_file.write('class A:\n    """Doc."""\n    def m(self):\n        """Doc."""\n\ndef f():\n    """Doc."""\n')
+        temp_python_file.flush()
+        
+        result = parser.parse_file(temp_python_file.name, include_docstrings=False)
+        
+        assert result.classes[0].docstring is None
+        assert result.classes[0].methods[0].docstring is None
+        assert result.functions[0].docstring is None
+        assert parser.parse_file(temp_python_file.name).functions[0].docstring == "Doc."
+    
     def test_parse_syntax_error(self, parser, temp_python_file):
         """Test parsing a file with syntax errors."""
         code = '''
@@ -337,6 +428,61 @@ def func2():
             assert len(results) == 1
             assert Path(results[0].file_path).name == "file1.py"
     
+    def test_parse_directory_skips_ignored_paths(self, parser):
+        """Test that cache/env directories and generated files are skipped."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmpdir_path = Path(tmpdir)
+            
+            (tmpdir_path / "module.py").write_text('def func(): pass')
+            (tmpdir_path / "messages_pb2.py").write_text('X = 1')
+            (tmpdir_path / "__init__.py").write_text('')
+            for name in ("__pycache__", ".venv", "site-packages"):
+                (tmpdir_path / name).mkdir()
+                (tmpdir_path / name / "skipped.py").write_text('def skipped(): pass')
+            
+            results = parser.parse_directory(str(tmpdir_path))
+            
+            by_name = {Path(r.file_path).name: r for r in results}
+            assert set(by_name) == {"module.py", "__init__.py"}
+            assert by_name["__init__.py"].parse_error is None
+            assert by_name["__init__.py"].functions == []
+            
+            results = parser.parse_directory(str(tmpdir_path), ignore_patterns=[])
+            assert {Path(r.file_path).name for r in results} == {
+                "module.py", "messages_pb2.py", "__init__.py"
+            }
+    
+    def test_iter_parse_directory_is_lazy(self, cached_parser):
+        """Test that files are parsed only as results are consumed."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmpdir_path = Path(tmpdir)
+            for i in range(3):
+                (tmpdir_path / f"module{i}.py").write_text(f"def func{i}(): pass")
+            
+            results = cached_parser.iter_parse_directory(str(tmpdir_path))
+            assert cached_parser._cache == {}
+            
+            first = next(results)
+            assert len(cached_parser._cache) == 1
+            assert len(first.functions) == 1
+            assert len(list(results)) == 2
+    
+    def test_iter_parse_directory_keeps_no_results_without_cache(self, parser):
+        """Test that a parser without cache_path does not retain parsed results."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmpdir_path = Path(tmpdir)
+            for i in range(8):
+                (tmpdir_path / f"module{i}.py").write_text(f"def func{i}(): pass")
+            
+            assert len(list(parser.iter_parse_directory(str(tmpdir_path)))) == 8
+            assert len(list(parser.iter_parse_directory(str(tmpdir_path), max_workers=2))) == 8
+            assert parser._cache == {}
+    
+    def test_iter_parse_directory_validates_eagerly(self, parser):
+        """Test that a bad directory fails before iteration starts."""
+        with pytest.raises(FileNotFoundError):
+            parser.iter_parse_directory("/nonexistent/directory")
+    
     def test_parse_directory_nonexistent(self, parser):
         """Test parsing a directory that doesn't exist."""
         with pytest.raises(FileNotFoundError):
@@ -349,3 +495,99 @@ def func2():
         
         with pytest.raises(ValueError):
             parser.parse_directory(temp_python_file.name)
+
+
+class TestParseCache:
+    """Test suite for the PythonFileParser result cache."""
+    
+    def test_unchanged_file_is_not_reparsed(self, cached_parser, temp_python_file):
+        """Test that parsing an unchanged file returns the cached result."""
+        temp_python_file.write("def func():\n    pass\n")
+        temp_python_file.flush()
+        
+        first = cached_parser.parse_file(temp_python_file.name)
+        second = cached_parser.parse_file(temp_python_file.name)
+        
+        assert second is first
+    
+    def test_modified_file_is_reparsed(self, cached_parser, temp_python_file):
+        """Test that a change to the file invalidates the cached result."""
+        temp_python_file.write("def func():\n    pass\n")
+        temp_python_file.flush()
+        cached_parser.parse_file(temp_python_file.name)
+        
+        temp_python_file.write("\ndef other_function():\n    pass\n")
+        temp_python_file.flush()
+        result = cached_parser.parse_file(temp_python_file.name)
+        
+        assert [f.name for f in result.functions] == ["func", "other_function"]
+    
+    def test_cache_persists_between_parsers(self, temp_python_file):
+        """Test that close() writes a cache that a new parser can reuse."""
+        temp_python_file.write("class Cached:\n    pass\n")
+        temp_python_file.flush()
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache_path = str(Path(tmpdir) / "parse_cache.pkl")
+            
+            parser = PythonFileParser(cache_path=cache_path)
+            parser.parse_file(temp_python_file.name)
+            parser.close()
+            
+            reloaded = PythonFileParser(cache_path=cache_path)
+            reloaded._parse_path = None  # Any parse would now fail
+            result = reloaded.parse_file(temp_python_file.name)
+            
+            assert [c.name for c in result.classes] == ["Cached"]
+    
+    def test_parse_directory_in_parallel(self, cached_parser):
+        """Test that parsing with several processes matches the serial result."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmpdir_path = Path(tmpdir)
+            for i in range(6):
+                (tmpdir_path / f"module{i}.py").write_text(f"def func{i}(a, b):\n    pass\n")
+            (tmpdir_path / "broken.py").write_text("def broken(:\n")
+            
+            serial = PythonFileParser().parse_directory(str(tmpdir_path))
+            parallel = cached_parser.parse_directory(str(tmpdir_path), max_workers=2)
+            
+            assert [r.file_path for r in parallel] == [r.file_path for r in serial]
+            assert parallel == serial
+            assert cached_parser.parse_file(parallel[0].file_path) is parallel[0]
+    
+    def test_parallel_results_use_interned_names(self, parser):
+        """Test that identifiers returned by worker processes are interned."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmpdir_path = Path(tmpdir)
+            for i in range(4):
+                (tmpdir_path / f"module{i}.py").write_text("def handler(request_payload):\n    pass\n")
+            
+            results = parser.parse_directory(str(tmpdir_path), max_workers=2)
+            
+            params = [r.functions[0].parameters[0] for r in results]
+            assert all(param is sys.intern("request_payload") for param in params)
+    
+    def test_parse_directory_invalid_max_workers(self, parser):
+        """Test that max_workers must be positive."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with pytest.raises(ValueError):
+                parser.parse_directory(tmpdir, max_workers=0)
+
+
+
+class TestCommandLine:
+    """Test suite for the python_parser command-line entry point."""
+    
+    def test_main_prints_summary(self, capsys):
+        """Test that main prints one line per file and reports parse errors."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmpdir_path = Path(tmpdir)
+            (tmpdir_path / "good.py").write_text("class A:\n    pass\n\ndef f():\n    pass\n")
+            
+            assert main([tmpdir]) == 0
+            assert "good.py: 1 classes, 1 functions" in capsys.readouterr().out
+            
+            (tmpdir_path / "bad.py").write_text("def broken(:\n")
+            
+            assert main([tmpdir]) == 1
+            assert "bad.py: Syntax error" in capsys.readouterr().out
@@ -50,6 +50,26 @@ class TestSettings:
         assert settings.api_port == 8000
         assert settings.aws_region == 'us-east-1'
     
+    def test_mongodb_pool_defaults_match_driver(self, monkeypatch):
+        """Test that unset pool variables keep pymongo's maxPoolSize and wait queue behavior."""
+        monkeypatch.delenv('MONGODB_MAX_POOL_SIZE', raising=False)
+        monkeypatch.delenv('MONGODB_WAIT_QUEUE_TIMEOUT_MS', raising=False)
+        
+        settings = Settings()
+        
+        assert settings.mongodb_max_pool_size == 100
+        assert settings.mongodb_wait_queue_timeout_ms is None
+    
+    def test_mongodb_pool_environment_variables_loaded(self, monkeypatch):
+        """Test that pool variables override the driver defaults when set."""
+        monkeypatch.setenv('MONGODB_MAX_POOL_SIZE', '15')
+        monkeypatch.setenv('MONGODB_WAIT_QUEUE_TIMEOUT_MS', '2000')
+        
+        settings = Settings()
+        
+        assert settings.mongodb_max_pool_size == 15
+        assert settings.mongodb_wait_queue_timeout_ms == 2000
+    
     def test_validate_success(self, monkeypatch):
         """Test that validate() passes with all required config present."""
         # Set up complete environment
@@ -0,0 +1,163 @@
+"""
+Unit tests for SimilarityService.
+
+These tests use small hand-built vectors so results can be checked exactly,
+without calling the embedding service.
+"""
+
+import math
+import numpy as np
+import pytest
+from datetime import datetime, timedelta
+from app.services.similarity_service import SimilarityService, quantize_embedding, INT8_SCALE
+
+
+def _timestamp(days_ago: int) -> str:
+    """ISO timestamp for a given number of days in the past."""
+    return (datetime.utcnow() - timedelta(days=days_ago)).isoformat()
+
+
+@pytest.fixture
+def service():
+    """Create a SimilarityService with default settings."""
+    return SimilarityService(similarity_threshold=0.85, cooldown_days=14)
+
+
+class TestCosineSimilarity:
+    """Tests for cosine_similarity."""
+
+    def test_matches_reference_formula(self, service):
+        """The result equals dot / (|a| |b|)."""
+        a = [0.1, 0.2, 0.3, 0.4]
+        b = [0.4, 0.1, 0.2, 0.3]
+        expected = sum(x * y for x, y in zip(a, b)) / (
+            math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+        )
+
+        assert service.cosine_similarity(a, b) == pytest.approx(expected, abs=1e-12)
+
+    def test_accepts_numpy_arrays(self, service):
+        """NumPy arrays are accepted as well as lists."""
+        assert service.cosine_similarity(np.array([1.0, 0.0]), [1.0, 0.0]) == pytest.approx(1.0)
+
+    def test_negative_similarity_is_clamped(self, service):
+        """Opposite vectors are clamped to 0."""
+        assert service.cosine_similarity([1.0, 0.0], [-1.0, 0.0]) == 0.0
+
+    @pytest.mark.parametrize("vec1,vec2", [
+        ([], [1.0]),
+        ([1.0, 2.0], [1.0]),
+        ([0.0, 0.0], [1.0, 1.0])
+    ])
+    def test_invalid_vectors(self, service, vec1, vec2):
+        """Empty, mismatched or zero vectors raise ValueError."""
+        with pytest.raises(ValueError):
+            service.cosine_similarity(vec1, vec2)
+
+
+class TestFilterRecommendations:
+    """Tests for filter_recommendations."""
+
+    def test_statuses(self, service):
+        """Recommendations are kept, marked as repeated or filtered by cooldown."""
+        historical = [
+            {"embedding": [1.0, 0.0, 0.0], "timestamp": _timestamp(3)},
+            {"embedding": [0.0, 1.0, 0.0], "timestamp": _timestamp(30)}
+        ]
+        new = [
+            {"id": "recent", "embedding": [0.99, 0.01, 0.0]},
+            {"id": "old", "embedding": [0.0, 0.98, 0.02]},
+            {"id": "fresh", "embedding": [0.0, 0.0, 1.0]}
+        ]
+
+        filtered = service.filter_recommendations(new, historical)
+
+        assert [(r["id"], r["status"]) for r in filtered] == [
+            ("old", "repeated_no_change"),
+            ("fresh", "new")
+        ]
+        assert filtered[0]["previous_timestamp"] == historical[1]["timestamp"]
+
+    def test_forces_first_when_all_filtered(self, service):
+        """At least one recommendation is returned."""
+        historical = [{"embedding": [1.0, 0.0], "timestamp": _timestamp(1)}]
+        new = [{"id": "a", "embedding": [1.0, 0.0]}, {"id": "b", "embedding": [0.9, 0.1]}]
+
+        filtered = service.filter_recommendations(new, historical)
+
+        assert [(r["id"], r["status"]) for r in filtered] == [("a", "forced")]
+
+    def test_no_historicals(self, service):
+        """Without history every recommendation is new."""
+        new = [{"id": "a", "embedding": [1.0, 0.0]}, {"id": "b", "embedding": [0.0, 1.0]}]
+
+        filtered = service.filter_recommendations(new, [])
+
+        assert [(r["id"], r["status"]) for r in filtered] == [("a", "new"), ("b", "new")]
+
+    def test_historicals_without_embedding_are_ignored(self, service):
+        """Historical entries missing embedding or timestamp are skipped."""
+        historical = [{"timestamp": _timestamp(1)}, {"embedding": [1.0, 0.0]}]
+
+        filtered = service.filter_recommendations([{"embedding": [1.0, 0.0]}], historical)
+
+        assert filtered[0]["status"] == "new"
+
+    def test_matches_pairwise_check(self, service):
+        """The batched filter and check agree with a per-pair is_similar scan."""
+        rng = np.random.default_rng(0)
+        base = rng.normal(size=(4, 16))
+        historical = [
+            {"embedding": list(base[i % 4] + rng.normal(scale=0.1, size=16)), "timestamp": _timestamp(i * 5)}
+            for i in range(8)
+        ]
+        new = [{"id": i, "embedding": list(v)} for i, v in enumerate(rng.normal(size=(6, 16)))]
+        new += [{"id": 10 + i, "embedding": list(base[i])} for i in range(4)]
+
+        expected = []
+        for rec in new:
+            match = next((h for h in historical if service.is_similar(rec["embedding"], h["embedding"])), None)
+            assert service.check_recommendation_similarity(rec, historical) == (
+                match is not None and service._within_cooldown(match), match
+            )
+            if match is None or not service._within_cooldown(match):
+                expected.append((rec["id"], "repeated_no_change" if match else "new"))
+
+        filtered = service.filter_recommendations([dict(r) for r in new], historical)
+
+        assert [(r["id"], r["status"]) for r in filtered] == expected
+
+
+
+class TestInt8Screening:
+    """Tests for int8-quantized embeddings."""
+
+    def test_quantize_embedding(self):
+        """Embeddings are normalized and scaled to int8."""
+        codes = quantize_embedding([3.0, 4.0, 0.0])
+
+        assert codes.dtype == np.int8
+        assert codes.tolist() == [76, 102, 0]
+        assert abs(int(codes.astype(np.int32) @ codes.astype(np.int32)) - INT8_SCALE ** 2) < INT8_SCALE
+
+    def test_quantize_zero_vector(self):
+        """Zero vectors cannot be quantized."""
+        with pytest.raises(ValueError):
+            quantize_embedding([0.0, 0.0])
+
+    def test_screened_filter_matches_float_filter(self, service):
+        """Historicals with int8 codes give the same result as float-only ones."""
+        rng = np.random.default_rng(1)
+        base = rng.normal(size=(4, 64))
+        historical = [
+            {"embedding": list(base[i % 4] + rng.normal(scale=0.3, size=64)), "timestamp": _timestamp(i * 5)}
+            for i in range(8)
+        ]
+        new = [{"id": i, "embedding": list(v)} for i, v in enumerate(rng.normal(size=(6, 64)))]
+        new += [{"id": 10 + i, "embedding": list(base[i])} for i in range(4)]
+        quantized = [dict(h, embedding_int8=quantize_embedding(h["embedding"]).tobytes()) for h in historical]
+
+        expected = service.filter_recommendations([dict(r) for r in new], historical)
+        filtered = service.filter_recommendations([dict(r) for r in new], quantized)
+
+        assert [(r["id"], r["status"]) for r in filtered] == [(r["id"], r["status"]) for r in expected]